@@ -1,5 +1,13 @@
 """Core utilities for the Wargame Knowledge & Memory System reference implementation."""
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from . import chunking, config, documents, embeddings, ingest, vectorstore
+
 __all__ = [
     "chunking",
     "config",
@@ -8,3 +16,19 @@ __all__ = [
     "ingest",
     "vectorstore",
 ]
+
+# Submodules are imported on first attribute access to keep ``import wargame_mcp`` cheap.
+_LAZY_SUBMODULES = {name: f".{name}" for name in __all__}
+
+
+def __getattr__(name: str) -> Any:
+    target = _LAZY_SUBMODULES.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(target, __name__)
+    globals()[name] = module
+    return module
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_SUBMODULES))
@@ -0,0 +1,38 @@
+"""JSON helpers that use orjson when it is installed and the stdlib otherwise."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # pragma: no cover - prefer the faster encoder when available
+    import orjson
+except Exception:  # pragma: no cover - fallback for minimal installs
+    orjson = None  # type: ignore
+
+
+if orjson is not None:  # pragma: no cover - depends on optional dependency
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can catch the latter
+    loads = orjson.loads
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize ``obj`` to UTF-8 JSON bytes, stringifying unknown types."""
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    def dumps(obj: Any) -> str:
+        """Serialize ``obj`` to a JSON string, stringifying unknown types."""
+        return dumps_bytes(obj).decode()
+
+else:  # pragma: no cover - depends on optional dependency
+    loads = json.loads
+
+    def dumps(obj: Any) -> str:
+        """Serialize ``obj`` to a JSON string, stringifying unknown types."""
+        return json.dumps(obj, default=str)
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize ``obj`` to UTF-8 JSON bytes, stringifying unknown types."""
+        return dumps(obj).encode()
+
+
+__all__ = ["dumps", "dumps_bytes", "loads"]
@@ -30,16 +30,9 @@ else:
             self.rows.append(tuple(str(value) for value in values))
 
         def __str__(self) -> str:
-            lines: list[str] = []
-            if self.title:
-                lines.append(self.title)
-            if self.columns:
-                header = " | ".join(self.columns)
-                lines.append(header)
-                lines.append("-" * len(header))
-            for row in self.rows:
-                lines.append(" | ".join(row))
-            return "\n".join(lines)
+            header = " | ".join(self.columns)
+            preamble = filter(None, (self.title, header, "-" * len(header)))
+            return "\n".join([*preamble, *(" | ".join(row) for row in self.rows)])
 
     class Console:  # pragma: no cover - simple text fallback
         def print(self, *values, **_kwargs) -> None:
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
-import json
+import atexit
 import logging
+import logging.handlers
+import queue
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
 
+from ._json_compat import dumps
+
 
 class _ContextVarsModule:
     @staticmethod
@@ -17,7 +21,7 @@ class _ContextVarsModule:
 
 class _JSONRenderer:
     def __call__(self, _logger, _method_name: str, event_dict: dict[str, Any]) -> str:
-        return json.dumps(event_dict, default=str)
+        return dumps(event_dict)
 
 
 class _TimeStamper:
@@ -57,26 +61,90 @@ contextvars = _ContextVarsModule()
 processors = _ProcessorsModule()
 
 
+class _EventMessage:
+    """Log message holding the event payload; it is only serialized when formatted."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self.payload = payload
+
+    def snapshot(self) -> None:
+        # The payload is owned by this message, so copying values in place is safe
+        payload = self.payload
+        for key, value in payload.items():
+            if isinstance(value, (dict, list, set)):
+                payload[key] = value.copy()
+
+    def __str__(self) -> str:
+        return dumps(self.payload)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records unformatted so rendering happens on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only records that are actually queued pay for copying their mutable fields
+        if isinstance(record.msg, _EventMessage):
+            record.msg.snapshot()
+        return record
+
+
 @dataclass
 class _Logger:
     name: str | None = None
+    context: dict[str, Any] = field(default_factory=dict)
     _logger: logging.Logger = field(init=False)
 
     def __post_init__(self) -> None:
         self._logger = logging.getLogger(self.name or "wargame_mcp")
 
+    def bind(self, **kwargs: Any) -> _Logger:
+        return _Logger(self.name, {**self.context, **kwargs})
+
     def info(self, event: str, **kwargs: Any) -> None:
-        self._logger.info(json.dumps({"event": event, **kwargs}, default=str))
+        self._logger.info(_EventMessage({"event": event, **self.context, **kwargs}))
 
     def warning(self, event: str, **kwargs: Any) -> None:
-        self._logger.warning(json.dumps({"event": event, **kwargs}, default=str))
+        self._logger.warning(_EventMessage({"event": event, **self.context, **kwargs}))
 
     def error(self, event: str, **kwargs: Any) -> None:
-        self._logger.error(json.dumps({"event": event, **kwargs}, default=str))
+        self._logger.error(_EventMessage({"event": event, **self.context, **kwargs}))
+
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def configure(**_kwargs: Any) -> None:
-    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    """Route root logging through a queue drained by a background listener thread.
+
+    Like ``logging.basicConfig``, this does nothing when the root logger already has
+    handlers of its own; only a queue handler from an earlier call is replaced.
+    """
+    global _listener
+    root = logging.getLogger()
+    if any(not isinstance(h, _DeferredQueueHandler) for h in root.handlers):
+        return
+    _stop_listener()
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    root.handlers = [_DeferredQueueHandler(records)]
+    root.setLevel(logging.INFO)
+    _listener = logging.handlers.QueueListener(
+        records, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+
+atexit.register(_stop_listener)
 
 
 def get_logger(name: str | None = None) -> _Logger:
@@ -0,0 +1,33 @@
+"""Dependency-free vector helpers shared by embedding providers, caches and the store."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def quantize_int8(vector: Sequence[float]) -> tuple[array, float]:
+    """Scalar-quantize ``vector`` to int8 with a per-vector scale (``value ≈ q * scale``)."""
+
+    max_abs = max(map(abs, vector), default=0.0)
+    if max_abs == 0:
+        return array("b", bytes(len(vector))), 0.0
+    factor = 127.0 / max_abs
+    return array("b", [round(x * factor) for x in vector]), max_abs / 127.0
+
+
+def dequantize_int8(values: Sequence[int], scale: float) -> list[float]:
+    return [q * scale for q in values]
+
+
+def l2_normalize(vector: Sequence[float]) -> list[float]:
+    """Scale ``vector`` to unit length as a new list; zero vectors keep their values."""
+    norm = math.hypot(*vector)
+    if norm == 0:
+        return list(vector)
+    inverse = 1.0 / norm
+    return [x * inverse for x in vector]
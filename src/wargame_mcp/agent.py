@@ -3,23 +3,12 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass, field
 from importlib import import_module
 from typing import Any, Protocol
 
-from .mcp_tools import (
-    get_document_span,
-    health_check_status,
-    list_collections_summary,
-    search_wargame_documents,
-)
-from .memory_tools import (
-    memory_add_entry,
-    memory_delete_entry,
-    memory_list_entries,
-    memory_search_entries,
-)
+from ._json_compat import dumps, loads
 
 SYSTEM_PROMPT = """You are the WargameAssistantAgent, a doctrine-focused analyst.
 Always follow this doctrine:
@@ -31,17 +20,27 @@ Always follow this doctrine:
 """
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class MCPServer:
-    """Configuration for a single MCP server exposed to the agent."""
+    """Configuration for a single MCP server exposed to the agent.
+
+    ``env`` may be given as a mapping or as ``(name, value)`` pairs; either way it is
+    stored as sorted pairs so instances stay immutable and hashable.
+    """
 
     server_name: str
     command: str
     args: tuple[str, ...] = ()
-    env: dict[str, str] | None = None
+    env: Mapping[str, str] | tuple[tuple[str, str], ...] | None = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "args", tuple(self.args))
+        if self.env is not None:
+            items = self.env.items() if isinstance(self.env, Mapping) else self.env
+            object.__setattr__(self, "env", tuple(sorted(items)))
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class AgentConfig:
     """Runtime knobs for the OpenAI agent orchestration."""
 
@@ -73,7 +72,7 @@ def create_openai_client(**kwargs: Any) -> OpenAIClient:
     return client_class(**kwargs)
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class ParsedToolCall:
     """Normalized representation of an OpenAI tool call payload."""
 
@@ -83,7 +82,8 @@ class ParsedToolCall:
     arguments: dict[str, Any]
 
 
-ToolExecutor = Callable[[ParsedToolCall], str]
+# Executors may return a ready JSON string or any JSON-serializable payload.
+ToolExecutor = Callable[[ParsedToolCall], Any]
 
 
 class WargameAssistantAgent:
@@ -124,7 +124,10 @@ class WargameAssistantAgent:
             outputs = []
             for raw_call in tool_calls:
                 parsed = parse_tool_call(raw_call)
-                outputs.append({"tool_call_id": parsed.id, "output": tool_executor(parsed)})
+                output = tool_executor(parsed)
+                if not isinstance(output, str):
+                    output = dumps(output)
+                outputs.append({"tool_call_id": parsed.id, "output": output})
             response = self.client.responses.create(response_id=response.id, tool_outputs=outputs)
 
         if getattr(response, "status", None) not in {"completed", "finished", None}:
@@ -156,7 +159,11 @@ def build_agent_payload(
 
 
 def build_tool_resources(config: AgentConfig) -> dict[str, list[dict[str, Any]]]:
-    """Serialize MCP server definitions for the Responses API."""
+    """Serialize MCP server definitions for the Responses API.
+
+    Building the manifest is a few small dicts, cheaper than caching it and copying the
+    cached entries, so each call returns fresh data that callers may modify.
+    """
 
     servers = [config.rag_server]
     if config.mem0_server is not None:
@@ -169,44 +176,48 @@ def build_tool_resources(config: AgentConfig) -> dict[str, list[dict[str, Any]]]
                 "server_name": server.server_name,
                 "command": server.command,
                 "args": list(server.args),
-                "env": server.env or {},
+                "env": dict(server.env or {}),
             }
             for server in servers
         ]
     }
 
 
+def _lookup(value: Any, name: str) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return value.get(name)
+    return getattr(value, name, None)
+
+
 def parse_tool_call(raw_call: Any) -> ParsedToolCall:
     """Handle tool call payloads from real or fake OpenAI responses."""
 
     if isinstance(raw_call, ParsedToolCall):
         return raw_call
 
-    def _lookup(value: Any, name: str) -> Any:
-        if value is None:
-            return None
-        if isinstance(value, dict):
-            return value.get(name)
-        return getattr(value, name, None)
+    # Payloads are either plain dicts (fakes, raw JSON) or SDK objects; pick the accessor once
+    if isinstance(raw_call, dict):
+        get = raw_call.get
+    else:
 
-    call_id = _lookup(raw_call, "id") or "tool-call"
+        def get(name: str) -> Any:
+            return getattr(raw_call, name, None)
+
+    function = get("function")
+    call_id = get("id") or "tool-call"
     server_name = (
-        _lookup(raw_call, "server_name")
-        or _lookup(raw_call, "serverName")
-        or _lookup(_lookup(raw_call, "mcp"), "server_name")
+        get("server_name")
+        or get("serverName")
+        or _lookup(get("mcp"), "server_name")
         or "wargame-rag-mcp"
     )
-    tool_name = (
-        _lookup(raw_call, "tool_name")
-        or _lookup(raw_call, "name")
-        or _lookup(_lookup(raw_call, "function"), "name")
-    )
-    arguments = (
-        _lookup(raw_call, "arguments") or _lookup(_lookup(raw_call, "function"), "arguments") or {}
-    )
+    tool_name = get("tool_name") or get("name") or _lookup(function, "name")
+    arguments = get("arguments") or _lookup(function, "arguments") or {}
     if isinstance(arguments, str):
         try:
-            arguments = json.loads(arguments)
+            arguments = loads(arguments)
         except json.JSONDecodeError:
             arguments = {"raw": arguments}
     if not isinstance(arguments, dict):
@@ -234,17 +245,14 @@ def extract_response_text(response: Any) -> str:
     for block in output:
         contents = getattr(block, "content", None) or []
         for content in contents:
-            text = (
-                getattr(content, "text", None) or content.get("text")
-                if isinstance(content, dict)
-                else None
-            )
+            if isinstance(content, dict):
+                text = content.get("text")
+                if not text and content.get("type") == "output_text":
+                    text = content.get("output")
+            else:
+                text = getattr(content, "text", None)
             if text:
-                return text.strip()
-            if isinstance(content, dict) and content.get("type") == "output_text":
-                candidate = content.get("output", "")
-                if candidate:
-                    return str(candidate).strip()
+                return str(text).strip()
     if hasattr(response, "content") and isinstance(response.content, list):
         for item in response.content:
             text = item.get("text") if isinstance(item, dict) else getattr(item, "text", None)
@@ -254,13 +262,28 @@ def extract_response_text(response: Any) -> str:
 
 
 class LocalToolExecutor:
-    """Executes tool calls directly against the in-process helpers (for tests/demo)."""
+    """Executes tool calls directly against the in-process helpers (for tests/demo).
+
+    Results are returned as plain dicts; ``run_conversation`` serializes them once.
+    """
 
     def __init__(self, *, fake_embeddings: bool = False) -> None:
         self.fake_embeddings = fake_embeddings
         self.history: list[ParsedToolCall] = []
-
-    def __call__(self, call: ParsedToolCall) -> str:
+        self._rag_tools: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+            "search_wargame_docs": self._search_docs,
+            "get_doc_span": self._get_doc_span,
+            "list_collections": self._list_collections,
+            "health_check": self._health_check,
+        }
+        self._memory_tools: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+            "memory_search": self._memory_search,
+            "memory_add": self._memory_add,
+            "memory_delete": self._memory_delete,
+            "memory_list": self._memory_list,
+        }
+
+    def __call__(self, call: ParsedToolCall) -> dict[str, Any]:
         self.history.append(call)
         if call.server_name == "wargame-rag-mcp":
             return self._run_rag_tool(call)
@@ -268,78 +291,103 @@ class LocalToolExecutor:
             return self._run_memory_tool(call)
         raise ValueError(f"Unsupported MCP server: {call.server_name}")
 
-    def _run_rag_tool(self, call: ParsedToolCall) -> str:
-        name = call.tool_name
-        args = call.arguments
-        if name == "search_wargame_docs":
-            try:
-                top_k = int(args.get("top_k", 8))
-                min_score = float(args.get("min_score", 0.0))
-            except (ValueError, TypeError) as exc:
-                return json.dumps({"error": f"Invalid parameter type: {exc}"})
-            result = search_wargame_documents(
-                query_text=args.get("query") or args.get("query_text", ""),
-                top_k=top_k,
-                min_score=min_score,
-                collections=args.get("collections"),
-                fake_embeddings=self.fake_embeddings,
-            )
-            return json.dumps(result.as_dict())
-        if name == "get_doc_span":
-            try:
-                center_chunk_index = int(args.get("center_chunk_index", 0))
-                span = int(args.get("span", 2))
-            except (ValueError, TypeError) as exc:
-                return json.dumps({"error": f"Invalid parameter type: {exc}"})
-            payload = get_document_span(
-                document_id=args["document_id"],
-                center_chunk_index=center_chunk_index,
-                span=span,
-            )
-            return json.dumps(payload)
-        if name == "list_collections":
-            return json.dumps(list_collections_summary())
-        if name == "health_check":
-            return json.dumps(health_check_status())
-        raise ValueError(f"Unsupported RAG tool: {name}")
-
-    def _run_memory_tool(self, call: ParsedToolCall) -> str:
-        name = call.tool_name
-        args = call.arguments
-        if name == "memory_search":
-            try:
-                limit = int(args.get("limit", 5))
-            except (ValueError, TypeError) as exc:
-                return json.dumps({"error": f"Invalid parameter type: {exc}"})
-            payload = memory_search_entries(
-                query=args.get("query", ""),
-                user_id=args["user_id"],
-                limit=limit,
-                scopes=args.get("scopes"),
-            )
-            return json.dumps(payload)
-        if name == "memory_add":
-            payload = memory_add_entry(
-                user_id=args["user_id"],
-                memory=args["memory"],
-                scope=args.get("scope"),
-                tags=args.get("tags"),
-                source=args.get("source"),
-            )
-            return json.dumps(payload)
-        if name == "memory_delete":
-            payload = memory_delete_entry(memory_id=args["memory_id"])
-            return json.dumps(payload)
-        if name == "memory_list":
-            try:
-                limit = int(args.get("limit", 5))
-            except (ValueError, TypeError) as exc:
-                return json.dumps({"error": f"Invalid parameter type: {exc}"})
-            payload = memory_list_entries(
-                user_id=args["user_id"],
-                limit=limit,
-                scope=args.get("scope"),
-                tags=args.get("tags"),
-            )
-            return json.dumps(payload)
-        raise ValueError(f"Unsupported memory tool: {name}")
+    def _run_rag_tool(self, call: ParsedToolCall) -> dict[str, Any]:
+        handler = self._rag_tools.get(call.tool_name)
+        if handler is None:
+            raise ValueError(f"Unsupported RAG tool: {call.tool_name}")
+        return handler(call.arguments)
+
+    def _run_memory_tool(self, call: ParsedToolCall) -> dict[str, Any]:
+        handler = self._memory_tools.get(call.tool_name)
+        if handler is None:
+            raise ValueError(f"Unsupported memory tool: {call.tool_name}")
+        return handler(call.arguments)
+
+    # --- RAG tools ------------------------------------------------------
+    # Tool helpers are imported lazily so payload helpers do not pull in the
+    # embedding/vectorstore or Mem0 client stacks.
+    def _search_docs(self, args: dict[str, Any]) -> dict[str, Any]:
+        from .mcp_tools import search_wargame_documents
+
+        try:
+            top_k = int(args.get("top_k", 8))
+            min_score = float(args.get("min_score", 0.0))
+        except (ValueError, TypeError) as exc:
+            return {"error": f"Invalid parameter type: {exc}"}
+        result = search_wargame_documents(
+            query_text=args.get("query") or args.get("query_text", ""),
+            top_k=top_k,
+            min_score=min_score,
+            collections=args.get("collections"),
+            fake_embeddings=self.fake_embeddings,
+        )
+        return result.as_dict()
+
+    def _get_doc_span(self, args: dict[str, Any]) -> dict[str, Any]:
+        from .mcp_tools import get_document_span
+
+        try:
+            center_chunk_index = int(args.get("center_chunk_index", 0))
+            span = int(args.get("span", 2))
+        except (ValueError, TypeError) as exc:
+            return {"error": f"Invalid parameter type: {exc}"}
+        return get_document_span(
+            document_id=args["document_id"],
+            center_chunk_index=center_chunk_index,
+            span=span,
+        )
+
+    def _list_collections(self, _args: dict[str, Any]) -> dict[str, Any]:
+        from .mcp_tools import list_collections_summary
+
+        return list_collections_summary()
+
+    def _health_check(self, _args: dict[str, Any]) -> dict[str, Any]:
+        from .mcp_tools import health_check_status
+
+        return health_check_status()
+
+    # --- memory tools ---------------------------------------------------
+    def _memory_search(self, args: dict[str, Any]) -> dict[str, Any]:
+        from .memory_tools import memory_search_entries
+
+        try:
+            limit = int(args.get("limit", 5))
+        except (ValueError, TypeError) as exc:
+            return {"error": f"Invalid parameter type: {exc}"}
+        return memory_search_entries(
+            query=args.get("query", ""),
+            user_id=args["user_id"],
+            limit=limit,
+            scopes=args.get("scopes"),
+        )
+
+    def _memory_add(self, args: dict[str, Any]) -> dict[str, Any]:
+        from .memory_tools import memory_add_entry
+
+        return memory_add_entry(
+            user_id=args["user_id"],
+            memory=args["memory"],
+            scope=args.get("scope"),
+            tags=args.get("tags"),
+            source=args.get("source"),
+        )
+
+    def _memory_delete(self, args: dict[str, Any]) -> dict[str, Any]:
+        from .memory_tools import memory_delete_entry
+
+        return memory_delete_entry(memory_id=args["memory_id"])
+
+    def _memory_list(self, args: dict[str, Any]) -> dict[str, Any]:
+        from .memory_tools import memory_list_entries
+
+        try:
+            limit = int(args.get("limit", 5))
+        except (ValueError, TypeError) as exc:
+            return {"error": f"Invalid parameter type: {exc}"}
+        return memory_list_entries(
+            user_id=args["user_id"],
+            limit=limit,
+            scope=args.get("scope"),
+            tags=args.get("tags"),
+        )
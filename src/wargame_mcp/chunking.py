@@ -2,48 +2,69 @@
 
 from __future__ import annotations
 
-import importlib.util
+import os
+from array import array
 from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from .documents import DocumentChunk, DocumentMetadata
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
-    from pathlib import Path
+
     import tiktoken
 
 CHUNK_SIZE_TOKENS = 800
 CHUNK_OVERLAP_TOKENS = 200
+SUPPORTED_SUFFIXES = (".md",)
+_SUPPORTED_SUFFIX_SET = frozenset(SUPPORTED_SUFFIXES)
+DEFAULT_ENCODING = "cl100k_base"
 
-tokenizer_cache: dict[str, Any] = {}
 
+class _FallbackEncoding:  # pragma: no cover - used only without tiktoken
+    def encode(self, text: str) -> list[int]:
+        return list(text.encode("utf-8"))
 
-def _get_tiktoken():
-    spec = importlib.util.find_spec("tiktoken")
-    if spec is None:  # pragma: no cover - optional dependency
-        class _FallbackEncoding:
-            def encode(self, text: str) -> list[int]:
-                return list(text.encode("utf-8"))
+    def decode(self, tokens: Iterable[int]) -> str:
+        return bytes(list(tokens)).decode("utf-8", errors="ignore")
 
-            def decode(self, tokens: list[int]) -> str:
-                return bytes(tokens).decode("utf-8", errors="ignore")
 
-        class _FallbackTiktoken:
-            def encoding_for_model(self, _model: str) -> _FallbackEncoding:
-                return _FallbackEncoding()
+class _FallbackTiktoken:  # pragma: no cover - used only without tiktoken
+    _encoding = _FallbackEncoding()
 
-        return _FallbackTiktoken()
-    import tiktoken
+    def encoding_for_model(self, _model: str) -> _FallbackEncoding:
+        return self._encoding
+
+    def get_encoding(self, _name: str) -> _FallbackEncoding:
+        return self._encoding
 
-    return tiktoken
 
+_tiktoken: Any = None
 
+
+def _get_tiktoken():
+    """Resolve tiktoken (or the byte-level fallback) once, on first use."""
+    global _tiktoken
+    if _tiktoken is None:
+        try:
+            import tiktoken
+        except ImportError:  # pragma: no cover - optional dependency
+            _tiktoken = _FallbackTiktoken()
+        else:
+            _tiktoken = tiktoken
+    return _tiktoken
+
+
+@lru_cache(maxsize=16)
 def _encoding_for_model(model: str) -> tiktoken.Encoding:
     tiktoken = _get_tiktoken()
-    if model not in tokenizer_cache:
-        tokenizer_cache[model] = tiktoken.encoding_for_model(model)
-    return tokenizer_cache[model]
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Unknown model names (custom deployments, tests) fall back to the OpenAI default
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
 
 
 @dataclass
@@ -59,55 +80,71 @@ def chunk_text(
 ) -> ChunkingResult:
     """Chunks text into overlapping fragments based on token counts."""
     encoding = _encoding_for_model(model)
-    tokens = encoding.encode(text)
+    # Pack token ids into a flat uint32 buffer; slicing copies raw ints, not boxed objects
+    tokens = array("I", encoding.encode(text))
     token_count = len(tokens)
 
     if not tokens:
         return ChunkingResult(chunks=[], token_count=0)
 
-    # First pass: determine chunk boundaries to get the real chunk count
-    boundaries: list[tuple[int, int]] = []
-    start = 0
-    while True:
-        end = min(token_count, start + CHUNK_SIZE_TOKENS)
-        boundaries.append((start, end))
-        if end >= token_count:
-            break
-        start += CHUNK_SIZE_TOKENS - CHUNK_OVERLAP_TOKENS
-
-    chunk_count = len(boundaries)
-
-    # Second pass: create the chunks with the correct metadata
-    chunks: list[DocumentChunk] = []
-    for i, (start, end) in enumerate(boundaries):
-        chunk_tokens = tokens[start:end]
-        chunk_text_str = encoding.decode(chunk_tokens)
-        chunk_id = f"{metadata.document_id}:{i}"
-        chunks.append(
-            DocumentChunk(
-                id=chunk_id,
-                text=chunk_text_str,
-                metadata=metadata,
-                chunk_index=i,
-                chunk_count=chunk_count,
-            )
+    # The chunk count is closed-form, so the chunks can be emitted in a single pass
+    step = CHUNK_SIZE_TOKENS - CHUNK_OVERLAP_TOKENS
+    if token_count <= CHUNK_SIZE_TOKENS:
+        chunk_count = 1
+    else:
+        chunk_count = 1 + (token_count - CHUNK_SIZE_TOKENS + step - 1) // step
+
+    # tiktoken's decode_batch is a Python loop over decode behind a fresh thread pool per
+    # call, so a direct loop is cheaper and adds no threads under ingest's worker pool
+    texts = [
+        encoding.decode(tokens[i * step : min(token_count, i * step + CHUNK_SIZE_TOKENS)])
+        for i in range(chunk_count)
+    ]
+
+    document_id = metadata.document_id
+    chunks = [
+        DocumentChunk(
+            id=f"{document_id}:{i}",
+            text=chunk_text_str,
+            metadata=metadata,
+            chunk_index=i,
+            chunk_count=chunk_count,
         )
+        for i, chunk_text_str in enumerate(texts)
+    ]
 
     return ChunkingResult(chunks=chunks, token_count=token_count)
 
 
 def read_text(path: Path) -> str:
-    data = path.read_text(encoding="utf-8")
-    return data.replace("\r\n", "\n")
+    # Re-ingesting an unchanged file (same mtime and size) reuses the decoded text
+    stat = path.stat()
+    return _read_text_cached(path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=256)
+def _read_text_cached(path: Path, _mtime_ns: int, _size: int) -> str:
+    # Universal-newline decoding already normalises CRLF to LF in a single pass
+    return path.read_text(encoding="utf-8")
 
 
 def supported_suffix(path: Path) -> bool:
-    return path.suffix.lower() == ".md"
+    name = path.name
+    dot = name.rfind(".")
+    return dot > 0 and name[dot:].lower() in _SUPPORTED_SUFFIX_SET
 
 
 def iter_documents(input_dir: Path) -> Iterable[Path]:
-    for path in input_dir.rglob("*"):
-        if path.name.startswith("."):
-            continue
-        if path.is_file() and supported_suffix(path):
-            yield path
+    # scandir reuses the d_type from the directory listing, avoiding a stat per entry
+    pending = [os.fspath(input_dir)]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    path = Path(entry.path)
+                    if supported_suffix(path):
+                        yield path
@@ -2,18 +2,14 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from pathlib import Path  # noqa: TCH003 - typer resolves annotations at runtime
 
 import typer
-from rich.console import Console
-from rich.table import Table
 
-from .embeddings import build_embedding_provider
-from .ingest import ingest_directory
-from .vectorstore import get_collection, query
+from ._rich_compat import Console, Table
 
-if TYPE_CHECKING:
-    from pathlib import Path
+# Ingest and the MCP tool helpers pull in openai/chromadb, so commands import them on
+# demand to keep ``--help`` and shell completion fast.
 
 app = typer.Typer(help="Utilities for the Wargame Knowledge & Memory System prototype.")
 console = Console()
@@ -22,6 +18,12 @@ console = Console()
 SNIPPET_MAX_LENGTH = 120
 
 
+def _snippet(text: str) -> str:
+    """Return a single-line preview of ``text``, truncated to ``SNIPPET_MAX_LENGTH``."""
+    head = text[:SNIPPET_MAX_LENGTH].replace("\n", " ")
+    return head + "…" if len(text) > SNIPPET_MAX_LENGTH else head
+
+
 @app.command()
 def ingest(
     input_dir: Path = typer.Argument(
@@ -30,6 +32,8 @@ def ingest(
     fake_embeddings: bool = typer.Option(False, help="Use deterministic fake embeddings."),
 ):
     """Ingest all supported documents from INPUT_DIR into Chroma."""
+    from .ingest import ingest_directory
+
     ingest_directory(input_dir, fake_embeddings=fake_embeddings)
 
 
@@ -46,15 +50,15 @@ def search_cmd(
     ),
 ):
     """Search previously ingested documents."""
-    provider = build_embedding_provider(fake=fake_embeddings)
-    collections_list = collections.split(",") if collections else None
-    results = query(
+    from .mcp_tools import search_wargame_documents
+
+    results = search_wargame_documents(
         query_text=query_text,
         top_k=top_k,
         min_score=min_score,
-        collections=collections_list,
-        embedding_provider=provider,
-    )
+        collections=collections.split(",") if collections else None,
+        fake_embeddings=fake_embeddings,
+    ).results
     if not results:
         console.print("No results found.")
         raise typer.Exit(code=0)
@@ -64,33 +68,36 @@ def search_cmd(
     table.add_column("Score", justify="right")
     table.add_column("Collection")
     table.add_column("Snippet")
-    for hit in results:
-        snippet = hit.text[:SNIPPET_MAX_LENGTH].replace("\n", " ") + (
-            "…" if len(hit.text) > SNIPPET_MAX_LENGTH else ""
+    rows = [
+        (
+            hit["id"],
+            f"{hit['score']:.3f}",
+            str(hit["metadata"].get("collection")),
+            _snippet(hit["text"]),
         )
-        table.add_row(hit.id, f"{hit.score:.3f}", str(hit.metadata.get("collection")), snippet)
+        for hit in results
+    ]
+    for row in rows:
+        table.add_row(*row)
     console.print(table)
 
 
 @app.command("list-collections")
 def list_collections() -> None:
     """List available collections and document counts."""
-    collection = get_collection()
-    agg = {}
-    for metadata in collection.get(include=[])["metadatas"]:
-        col = metadata.get("collection", "other")
-        agg[col] = agg.get(col, 0) + 1
+    from .mcp_tools import list_collections_summary
+
     table = Table(title="Collections")
     table.add_column("Name")
-    table.add_column("Chunks", justify="right")
-    for name, count in sorted(agg.items()):
-        table.add_row(name, str(count))
+    table.add_column("Documents", justify="right")
+    for summary in list_collections_summary()["collections"]:
+        table.add_row(summary["name"], str(summary["document_count"]))
     console.print(table)
 
 
 @app.command("health-check")
 def health_check() -> None:
     """Ensure we can reach the Chroma store."""
-    collection = get_collection()
-    count = collection.count()
-    console.print({"status": "ok", "details": f"{count} chunks indexed"})
+    from .mcp_tools import health_check_status
+
+    console.print(health_check_status())
@@ -16,6 +16,24 @@ class Settings:
     embedding_model: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-large")
     openai_api_key: str | None = os.getenv("OPENAI_API_KEY")
     openai_base_url: str | None = os.getenv("OPENAI_BASE_URL")
+    # Truncated output size for text-embedding-3-* models (e.g. 256); unset keeps the model default
+    embedding_dimensions: int | None = int(os.getenv("EMBEDDING_DIMENSIONS", "0")) or None
+    embed_batch_size: int = int(os.getenv("EMBED_BATCH_SIZE", "256"))
+    # Token budget per embedding request; OpenAI rejects requests over ~300k tokens
+    embed_batch_max_tokens: int = int(os.getenv("EMBED_BATCH_MAX_TOKENS", "250000"))
+    ingest_workers: int = int(os.getenv("INGEST_WORKERS", str(min(8, os.cpu_count() or 1))))
+    # Opt-in SQLite embedding cache used by ingestion; ignored when REDIS_URL is set
+    embedding_cache_path: str | None = os.getenv("EMBEDDING_CACHE_PATH") or None
+    # Shared Redis embedding cache used by OpenAIEmbeddingProvider when configured
+    redis_url: str | None = os.getenv("REDIS_URL")
+    embedding_cache_ttl: int | None = int(os.getenv("EMBEDDING_CACHE_TTL", "0")) or None
+    # "int8" stores cached and in-memory vectors scalar-quantized (4x smaller); "fp32" keeps floats
+    embedding_quantization: str = os.getenv("EMBEDDING_QUANTIZATION", "fp32").lower()
+    # Chroma HNSW graph degree and build/search beam widths; higher means better recall,
+    # slower queries. Applied when a collection is first created.
+    hnsw_m: int = int(os.getenv("HNSW_M", "32"))
+    hnsw_ef_construction: int = int(os.getenv("HNSW_EF_CONSTRUCTION", "200"))
+    hnsw_ef_search: int = int(os.getenv("HNSW_EF_SEARCH", "128"))
 
     # Mem0 configuration
     mem0_base_url: str | None = os.getenv("MEM0_BASE_URL")
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
@@ -51,15 +52,60 @@ class DocumentChunk:
 
     def chroma_metadata(self) -> dict:
         base = self.metadata.as_dict()
-        base.update(
-            {
-                "chunk_index": self.chunk_index,
-                "chunk_count": self.chunk_count,
-            }
-        )
+        base["chunk_index"] = self.chunk_index
+        base["chunk_count"] = self.chunk_count
         return base
 
 
+@dataclass(slots=True)
+class ChunkBatch:
+    """Column-oriented view of many chunks, used for bulk vector store writes.
+
+    Chunks of one document share a ``DocumentMetadata`` instance, so its dict form
+    is built once per document instead of once per chunk.
+    """
+
+    ids: list[str] = field(default_factory=list)
+    texts: list[str] = field(default_factory=list)
+    metadatas: list[DocumentMetadata] = field(default_factory=list)
+    chunk_indices: list[int] = field(default_factory=list)
+    chunk_counts: list[int] = field(default_factory=list)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[DocumentChunk]) -> ChunkBatch:
+        batch = cls()
+        for chunk in chunks:
+            batch.ids.append(chunk.id)
+            batch.texts.append(chunk.text)
+            batch.metadatas.append(chunk.metadata)
+            batch.chunk_indices.append(chunk.chunk_index)
+            batch.chunk_counts.append(chunk.chunk_count)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def to_chroma_metadatas(self, tag_separator: str | None = None) -> list[dict]:
+        """Per-chunk metadata dicts; ``tag_separator`` joins tags into one string."""
+        # Serialize each distinct document (and its tags) up front so the per-chunk pass
+        # below is a branch-free dict merge.
+        bases: dict[int, dict] = {}
+        for metadata in {id(metadata): metadata for metadata in self.metadatas}.values():
+            base = metadata.as_dict()
+            if tag_separator is not None:
+                # Stored tag strings are stripped and blank-free, so readers can split them as-is
+                base["tags"] = tag_separator.join(
+                    tag for tag in (t.strip() for t in base["tags"]) if tag
+                )
+            bases[id(metadata)] = base
+        return [
+            {**bases[id(metadata)], "chunk_index": chunk_index, "chunk_count": chunk_count}
+            for metadata, chunk_index, chunk_count in zip(
+                self.metadatas, self.chunk_indices, self.chunk_counts, strict=True
+            )
+        ]
+
+
 @dataclass(slots=True)
 class IngestionSummary:
     document_count: int
@@ -86,16 +132,25 @@ def ensure_year(value: int | None) -> int | None:
     return None
 
 
+_ASCII_SLUG_TABLE = str.maketrans(
+    {chr(i): chr(i).lower() if chr(i).isalnum() else "-" for i in range(128)}
+)
+
+
 def slugify(text: str) -> str:
-    safe = [c.lower() if c.isalnum() else "-" for c in text]
-    slug = "".join(safe).strip("-")
+    if text.isascii():
+        slug = text.translate(_ASCII_SLUG_TABLE)
+    else:
+        slug = "".join([c.lower() if c.isalnum() else "-" for c in text])
     return "-".join(filter(None, slug.split("-")))
 
 
 def build_document_id(path: Path, title: str | None = None) -> str:
+    # blake2b is keyless here, so ids are stable across runs (unlike the salted hash())
+    digest = hashlib.blake2b(str(path).encode("utf-8"), digest_size=8).hexdigest()
     if title:
-        return f"{slugify(title)}-{abs(hash(path)) % (10**8)}"
-    return f"doc-{abs(hash(path)) % (10**12)}"
+        return f"{slugify(title)}-{digest}"
+    return f"doc-{digest}"
 
 
 def merge_tags(*tag_sets: Iterable[str]) -> list[str]:
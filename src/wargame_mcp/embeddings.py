@@ -3,6 +3,11 @@
 from __future__ import annotations
 
 import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from threading import Lock
 
 try:
     from openai import OpenAI
@@ -11,57 +16,160 @@ except Exception:  # pragma: no cover - optional dependency at runtime
 
 from typing import TYPE_CHECKING
 
+from ._vecmath import l2_normalize, quantize_int8
 from .config import SETTINGS
 
 if TYPE_CHECKING:
+    from array import array
     from collections.abc import Iterable
 
 
+# Precomputed byte -> [0, 1] float table so fake vectors reuse float objects.
+_BYTE_SCALE = [b / 255.0 for b in range(256)]
+
+
+# hashlib releases the GIL for inputs over 2 KiB (chunk texts usually are), so large
+# batches are hashed on a thread pool. OpenSSL picks SHA-NI instructions when present.
+_PARALLEL_DIGEST_MIN_TEXTS = 64
+
+
+def _sha256_digest(payload: bytes) -> bytes:
+    return hashlib.sha256(payload).digest()
+
+
+_DIGEST_WORKERS = min(32, os.cpu_count() or 1)
+_digest_pool: ThreadPoolExecutor | None = None
+_digest_pool_lock = Lock()
+
+
+def _get_digest_pool() -> ThreadPoolExecutor:
+    global _digest_pool
+    pool = _digest_pool
+    if pool is not None:
+        return pool
+    # Built on first large batch and reused, so each embed call skips thread start-up
+    with _digest_pool_lock:
+        if _digest_pool is None:
+            _digest_pool = ThreadPoolExecutor(
+                max_workers=_DIGEST_WORKERS, thread_name_prefix="sha256"
+            )
+        return _digest_pool
+
+
+def _sha256_digests(payloads: list[bytes]) -> list[bytes]:
+    if _DIGEST_WORKERS == 1 or len(payloads) < _PARALLEL_DIGEST_MIN_TEXTS:
+        return [_sha256_digest(payload) for payload in payloads]
+    return list(_get_digest_pool().map(_sha256_digest, payloads, chunksize=16))
+
+
 class EmbeddingProvider:
     def embed(self, texts: Iterable[str]) -> list[list[float]]:  # pragma: no cover - interface only
         raise NotImplementedError
 
+    def embed_quantized(self, texts: Iterable[str]) -> tuple[list[array], list[float]]:
+        """Embed ``texts`` and return int8 vectors with their per-vector scales."""
+
+        quantized = [quantize_int8(vector) for vector in self.embed(texts)]
+        return [values for values, _ in quantized], [scale for _, scale in quantized]
+
 
 class FakeEmbeddingProvider(EmbeddingProvider):
     """Deterministic hashing used for tests and offline workflows."""
 
-    def __init__(self, dimensions: int = 1536) -> None:
-        self.dimensions = dimensions
+    def __init__(self, dimensions: int | None = None) -> None:
+        self.dimensions = dimensions or SETTINGS.embedding_dimensions or 1536
 
     def embed(self, texts: Iterable[str]) -> list[list[float]]:
+        dimensions = self.dimensions
+        repeats = -(-dimensions // hashlib.sha256().digest_size)
         vectors: list[list[float]] = []
-        for text in texts:
-            digest = hashlib.sha256(text.encode("utf-8")).digest()
-            repeated = (digest * ((self.dimensions // len(digest)) + 1))[: self.dimensions]
-            vector = [b / 255.0 for b in repeated]
-            vectors.append(vector)
+        for digest in _sha256_digests([text.encode("utf-8") for text in texts]):
+            # Scale the 32 digest bytes once, then tile the list in C; the floats are shared
+            vectors.append((list(map(_BYTE_SCALE.__getitem__, digest)) * repeats)[:dimensions])
         return vectors
 
 
 class OpenAIEmbeddingProvider(EmbeddingProvider):
     def __init__(
-        self, model: str | None = None, api_key: str | None = None, base_url: str | None = None
+        self,
+        model: str | None = None,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        dimensions: int | None = None,
     ) -> None:
         self.model = model or SETTINGS.embedding_model
+        # text-embedding-3-* models support Matryoshka truncation via ``dimensions``
+        self.dimensions = dimensions or SETTINGS.embedding_dimensions
+        # Truncated vectors differ from full-size ones, so caches key on model and size
+        self.cache_namespace = (
+            f"{self.model}:{self.dimensions}d" if self.dimensions else self.model
+        )
         api_key = api_key or SETTINGS.openai_api_key
         if not api_key:
             raise RuntimeError("OPENAI_API_KEY is required for real embeddings")
         self._fallback = None
+        self._cache = None
+        if SETTINGS.redis_url:
+            from .embeddings_cache import RedisEmbeddingCache
+
+            self._cache = RedisEmbeddingCache.from_url(
+                SETTINGS.redis_url,
+                self.cache_namespace,
+                ttl_seconds=SETTINGS.embedding_cache_ttl,
+                quantization=SETTINGS.embedding_quantization,
+            )
         if OpenAI is None:
-            self._fallback = FakeEmbeddingProvider()
+            self._fallback = FakeEmbeddingProvider(self.dimensions)
             self.client = None
         else:
             self.client = OpenAI(api_key=api_key, base_url=base_url or SETTINGS.openai_base_url)
 
     def embed(self, texts: Iterable[str]) -> list[list[float]]:
-        texts_list = list(texts)
         if self._fallback is not None:
-            return self._fallback.embed(texts_list)
-        response = self.client.embeddings.create(model=self.model, input=texts_list)
-        return [item.embedding for item in response.data]
+            return self._fallback.embed(texts)
+        # Pull at most EMBED_BATCH_SIZE texts at a time so generators are never materialized
+        # in full; responses are concatenated in input order. This bounds the text count
+        # only; ingest splits its requests by EMBED_BATCH_MAX_TOKENS before calling here.
+        iterator = iter(texts)
+        batch_size = max(1, SETTINGS.embed_batch_size)
+        vectors: list[list[float]] = []
+        while batch := list(islice(iterator, batch_size)):
+            vectors.extend(self._embed_batch(batch))
+        return vectors
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        if self._cache is not None:
+            from .embeddings_cache import embed_with_cache
+
+            return embed_with_cache(self._embed_remote, texts, self._cache)
+        return self._embed_remote(texts)
+
+    def _embed_remote(self, texts: list[str]) -> list[list[float]]:
+        if self.dimensions is None:
+            response = self.client.embeddings.create(model=self.model, input=texts)
+            return [item.embedding for item in response.data]
+        response = self.client.embeddings.create(
+            model=self.model, input=texts, dimensions=self.dimensions
+        )
+        return [l2_normalize(item.embedding) for item in response.data]
 
 
 def build_embedding_provider(fake: bool = False) -> EmbeddingProvider:
     if fake or SETTINGS.openai_api_key is None:
         return FakeEmbeddingProvider()
-    return OpenAIEmbeddingProvider()
+    return _shared_openai_provider(
+        SETTINGS.embedding_model,
+        SETTINGS.openai_api_key,
+        SETTINGS.openai_base_url,
+        SETTINGS.embedding_dimensions,
+    )
+
+
+@lru_cache(maxsize=4)
+def _shared_openai_provider(
+    model: str, api_key: str, base_url: str | None, dimensions: int | None = None
+) -> OpenAIEmbeddingProvider:
+    # One provider (and thus one OpenAI client and its connection pool) per configuration
+    return OpenAIEmbeddingProvider(
+        model=model, api_key=api_key, base_url=base_url, dimensions=dimensions
+    )
@@ -0,0 +1,185 @@
+"""Content-addressed cache for embedding vectors."""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import sqlite3
+import struct
+from array import array
+from typing import TYPE_CHECKING, Any, Protocol
+
+from ._vecmath import dequantize_int8, quantize_int8
+from .instrumentation import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from pathlib import Path
+
+# SQLite caps bound parameters per statement; stay well below the default limit.
+_LOOKUP_BATCH = 500
+
+_INT8_SCALE = struct.Struct("<f")
+
+
+def text_digest(text: str) -> str:
+    """Return the hex SHA-256 digest used as the cache key for ``text``."""
+
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def pack_vector(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def unpack_vector(blob: bytes) -> list[float]:
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+def pack_int8_vector(vector: Sequence[float]) -> bytes:
+    """Pack ``vector`` as a float32 scale followed by int8 components (~4x smaller)."""
+
+    values, scale = quantize_int8(vector)
+    return _INT8_SCALE.pack(scale) + values.tobytes()
+
+
+def unpack_int8_vector(blob: bytes) -> list[float]:
+    (scale,) = _INT8_SCALE.unpack_from(blob)
+    return dequantize_int8(array("b", blob[_INT8_SCALE.size :]), scale)
+
+
+def _vector_codec(
+    model: str, quantization: str
+) -> tuple[str, Callable[[Sequence[float]], bytes], Callable[[bytes], list[float]]]:
+    # Quantized entries live under their own namespace so fp32 and int8 blobs never mix
+    if quantization == "int8":
+        return f"{model}:int8", pack_int8_vector, unpack_int8_vector
+    return model, pack_vector, unpack_vector
+
+
+class VectorCache(Protocol):
+    def get_many(self, texts: Sequence[str]) -> list[list[float] | None]:
+        ...  # pragma: no cover - protocol definition
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        ...  # pragma: no cover - protocol definition
+
+
+class EmbeddingCache:
+    """SQLite store mapping ``(model, sha256(text))`` to a float32 vector blob.
+
+    Keys include the embedding model, so switching models never serves stale vectors.
+    With ``quantization="int8"`` vectors are stored scalar-quantized instead.
+    """
+
+    def __init__(self, path: Path, model: str, quantization: str = "fp32") -> None:
+        self.model = model
+        self._namespace, self._pack, self._unpack = _vector_codec(model, quantization)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL, digest TEXT NOT NULL, vector BLOB NOT NULL,"
+            " PRIMARY KEY (model, digest))"
+        )
+
+    def get_many(self, texts: Sequence[str]) -> list[list[float] | None]:
+        digests = [text_digest(text) for text in texts]
+        found: dict[str, bytes] = {}
+        for start in range(0, len(digests), _LOOKUP_BATCH):
+            batch = digests[start : start + _LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                "SELECT digest, vector FROM embeddings"
+                f" WHERE model = ? AND digest IN ({placeholders})",
+                (self._namespace, *batch),
+            )
+            found.update(rows)
+        return [self._unpack(found[d]) if d in found else None for d in digests]
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        rows = [
+            (self._namespace, text_digest(text), self._pack(vector))
+            for text, vector in zip(texts, vectors, strict=True)
+        ]
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)", rows)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class RedisEmbeddingCache:
+    """Redis-backed cache shared by concurrent ingest workers and CLI invocations.
+
+    Keys are ``emb:{model}:{sha256(text)}`` and values little-endian float32 blobs.
+    Redis failures are logged and treated as cache misses.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        model: str,
+        ttl_seconds: int | None = None,
+        quantization: str = "fp32",
+    ) -> None:
+        self._client = client
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        self._namespace, self._pack, self._unpack = _vector_codec(model, quantization)
+
+    @classmethod
+    def from_url(
+        cls, url: str, model: str, ttl_seconds: int | None = None, quantization: str = "fp32"
+    ) -> RedisEmbeddingCache:
+        if importlib.util.find_spec("redis") is None:
+            raise RuntimeError(
+                "REDIS_URL is set but redis is not installed; install wargame-mcp[cache]"
+            )
+        import redis
+
+        return cls(redis.Redis.from_url(url), model, ttl_seconds, quantization)
+
+    def _key(self, text: str) -> str:
+        return f"emb:{self._namespace}:{text_digest(text)}"
+
+    def get_many(self, texts: Sequence[str]) -> list[list[float] | None]:
+        if not texts:
+            return []
+        try:
+            blobs = self._client.mget([self._key(text) for text in texts])
+        except Exception as exc:
+            logger.warning("embedding_cache.redis_error", operation="mget", error=str(exc))
+            return [None] * len(texts)
+        return [self._unpack(blob) if blob is not None else None for blob in blobs]
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for text, vector in zip(texts, vectors, strict=True):
+                pipe.set(self._key(text), self._pack(vector), ex=self.ttl_seconds)
+            pipe.execute()
+        except Exception as exc:
+            logger.warning("embedding_cache.redis_error", operation="set", error=str(exc))
+
+
+def embed_with_cache(
+    embed: Callable[[Sequence[str]], list[list[float]]],
+    texts: Sequence[str],
+    cache: VectorCache | None,
+) -> list[list[float]]:
+    """Embed ``texts`` through ``cache``, sending only cache misses to ``embed``."""
+
+    if cache is None or not texts:
+        return embed(texts)
+    vectors = cache.get_many(texts)
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+        missing_texts = [texts[i] for i in missing]
+        fresh = embed(missing_texts)
+        cache.put_many(missing_texts, fresh)
+        for i, vector in zip(missing, fresh, strict=True):
+            vectors[i] = vector
+    return vectors  # type: ignore[return-value]
@@ -3,21 +3,37 @@
 from __future__ import annotations
 
 import importlib.util
-from datetime import UTC, datetime
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
 from typing import TYPE_CHECKING
 
-from .chunking import chunk_text, iter_documents, read_text
+from .chunking import (
+    CHUNK_OVERLAP_TOKENS,
+    CHUNK_SIZE_TOKENS,
+    ChunkingResult,
+    chunk_text,
+    iter_documents,
+    read_text,
+)
 from .config import SETTINGS
 from .documents import DocumentChunk, IngestionSummary
-from .embeddings import build_embedding_provider
+from .embeddings import FakeEmbeddingProvider, build_embedding_provider
+from .embeddings_cache import EmbeddingCache, embed_with_cache
 from .metadata_loader import metadata_for_document
 from .vectorstore import delete_document, upsert_chunks
 
 if TYPE_CHECKING:
-    from pathlib import Path
+    from collections.abc import Iterable, Iterator
+    from concurrent.futures import Future
+
+    from .embeddings import EmbeddingProvider
 
 if importlib.util.find_spec("rich") is not None:
     from rich.console import Console  # pragma: no cover - optional dependency
+    from rich.progress import Progress  # pragma: no cover - optional dependency
     from rich.table import Table  # pragma: no cover - optional dependency
 
     console = Console()
@@ -32,6 +48,22 @@ else:  # pragma: no cover - fallback for environments without rich
             else:
                 print(message)
 
+    class Progress:  # pragma: no cover - placeholder
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info) -> None:
+            return None
+
+        def add_task(self, description: str, **_kwargs) -> int:
+            return 0
+
+        def advance(self, task_id: int, advance: float = 1) -> None:
+            return None
+
     class Table:  # pragma: no cover - placeholder
         def __init__(self, *args, **kwargs):
             self.rows = []
@@ -52,17 +84,12 @@ else:  # pragma: no cover - fallback for environments without rich
     console = Console()
 
 
-def _ingest_file(path: Path, fake_embeddings: bool) -> tuple[list[DocumentChunk], int]:
-    """Ingest a single file with comprehensive error handling."""
+def _prepare_chunks(path: Path) -> tuple[str, ChunkingResult]:
+    """Read and chunk a single file with comprehensive error handling."""
     try:
         metadata = metadata_for_document(path)
         text = read_text(path)
-        result = chunk_text(metadata, text, SETTINGS.embedding_model)
-        delete_document(metadata.document_id)
-        provider = build_embedding_provider(fake=fake_embeddings)
-        vectors = provider.embed([chunk.text for chunk in result.chunks])
-        upsert_chunks(result.chunks, vectors)
-        return result.chunks, result.token_count
+        return metadata.document_id, chunk_text(metadata, text, SETTINGS.embedding_model)
     except FileNotFoundError as exc:
         console.log(f"[red]ERROR:[/red] File not found: {path}")
         raise RuntimeError(f"File not found: {path}") from exc
@@ -74,26 +101,196 @@ def _ingest_file(path: Path, fake_embeddings: bool) -> tuple[list[DocumentChunk]
         raise RuntimeError(f"Failed to ingest {path}: {exc}") from exc
 
 
+def _try_prepare_chunks(path: Path) -> tuple[Path, tuple[str, ChunkingResult] | Exception]:
+    try:
+        return path, _prepare_chunks(path)
+    except Exception as exc:
+        return path, exc
+
+
+def _prepare_all(
+    paths: Iterable[Path],
+) -> Iterator[tuple[Path, tuple[str, ChunkingResult] | Exception]]:
+    """Read and chunk files on a thread pool, yielding results in input order.
+
+    tiktoken encodes/decodes outside the GIL, so chunking scales across threads;
+    embedding and upserts stay on the caller's thread. At most ``2 * workers`` files are
+    in flight, so memory follows the consumer's batches rather than the corpus size.
+    """
+    workers = SETTINGS.ingest_workers
+    if workers <= 1:
+        yield from map(_try_prepare_chunks, paths)
+        return
+    window = workers * 2
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight: deque[Future[tuple[Path, tuple[str, ChunkingResult] | Exception]]] = deque()
+        for path in paths:
+            in_flight.append(pool.submit(_try_prepare_chunks, path))
+            if len(in_flight) >= window:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def _finalize_upsert(
+    document_id: str, chunks: list[DocumentChunk], vectors: list[list[float]]
+) -> None:
+    """Replace the stored chunks of one document with freshly embedded ones."""
+    delete_document(document_id)
+    upsert_chunks(chunks, vectors)
+
+
+def _open_embedding_cache(provider: EmbeddingProvider) -> EmbeddingCache | None:
+    """Open the on-disk embedding cache for real providers, if configured.
+
+    Only one cache backend is used: with ``REDIS_URL`` set the provider already caches
+    through Redis, so the SQLite cache is skipped.
+    """
+    if isinstance(provider, FakeEmbeddingProvider) or not SETTINGS.embedding_cache_path:
+        return None
+    if SETTINGS.redis_url:
+        return None
+    model = (
+        getattr(provider, "cache_namespace", None)
+        or getattr(provider, "model", None)
+        or SETTINGS.embedding_model
+    )
+    return EmbeddingCache(
+        Path(SETTINGS.embedding_cache_path), model, quantization=SETTINGS.embedding_quantization
+    )
+
+
+def _chunk_token_counts(result: ChunkingResult) -> list[int]:
+    """Token counts of the chunks in ``result``; every chunk but the last is full-size."""
+    chunk_count = len(result.chunks)
+    if not chunk_count:
+        return []
+    step = CHUNK_SIZE_TOKENS - CHUNK_OVERLAP_TOKENS
+    last = result.token_count - (chunk_count - 1) * step
+    return [CHUNK_SIZE_TOKENS] * (chunk_count - 1) + [last]
+
+
+def _embedded_tokens(result: ChunkingResult) -> int:
+    """Tokens sent to the embedding API for ``result``, counting chunk overlaps twice."""
+    return sum(_chunk_token_counts(result))
+
+
+def _embedding_requests(batch: list[tuple[Path, str, ChunkingResult]]) -> Iterator[list[str]]:
+    """Split the batch's chunk texts into requests within the text-count and token budgets.
+
+    The split is per chunk, so even a single document larger than the token budget is
+    sent as several requests rather than one the API would reject.
+    """
+    max_texts = max(1, SETTINGS.embed_batch_size)
+    max_tokens = max(1, SETTINGS.embed_batch_max_tokens)
+    texts: list[str] = []
+    tokens = 0
+    for _, _, result in batch:
+        for chunk, chunk_tokens in zip(result.chunks, _chunk_token_counts(result), strict=True):
+            if texts and (len(texts) >= max_texts or tokens + chunk_tokens > max_tokens):
+                yield texts
+                texts, tokens = [], 0
+            texts.append(chunk.text)
+            tokens += chunk_tokens
+    if texts:
+        yield texts
+
+
+def _embed_batch(
+    batch: list[tuple[Path, str, ChunkingResult]],
+    provider: EmbeddingProvider,
+    cache: EmbeddingCache | None,
+    failed_files: list[tuple[Path, str]],
+) -> tuple[int, int, int]:
+    """Embed the chunks of several files in one call and upsert them per document.
+
+    Returns the document, chunk and token counts of the successfully stored files.
+    """
+    try:
+        vectors: list[list[float]] = []
+        for texts in _embedding_requests(batch):
+            if cache is None:
+                vectors.extend(provider.embed(texts))
+            else:
+                vectors.extend(embed_with_cache(provider.embed, texts, cache))
+    except Exception as exc:
+        for file_path, _, _ in batch:
+            failed_files.append((file_path, f"Failed to embed {file_path}: {exc}"))
+            console.log(f"[red]✗[/red] Failed to embed {file_path}: {exc}")
+        return 0, 0, 0
+
+    document_count = chunk_count = token_count = 0
+    offset = 0
+    for file_path, document_id, result in batch:
+        chunks = result.chunks
+        doc_vectors = vectors[offset : offset + len(chunks)]
+        offset += len(chunks)
+        try:
+            _finalize_upsert(document_id, chunks, doc_vectors)
+        except Exception as exc:
+            failed_files.append((file_path, str(exc)))
+            console.log(f"[red]✗[/red] Failed to ingest {file_path}: {exc}")
+            continue
+        document_count += 1
+        chunk_count += len(chunks)
+        token_count += result.token_count
+    return document_count, chunk_count, token_count
+
+
 def ingest_directory(input_dir: Path, fake_embeddings: bool = False) -> IngestionSummary:
-    """Ingest all documents from a directory with error handling and reporting."""
+    """Ingest all documents from a directory with error handling and reporting.
+
+    Chunks from several files are embedded together, in requests of at most
+    ``SETTINGS.embed_batch_size`` texts and ``SETTINGS.embed_batch_max_tokens`` tokens,
+    then upserted per document. Progress is shown as a single transient bar rather than a
+    log line per file.
+    """
     start = datetime.now(UTC)
+    started = time.perf_counter()
     document_count = 0
     chunk_count = 0
     token_count = 0
     failed_files: list[tuple[Path, str]] = []
+    provider = build_embedding_provider(fake=fake_embeddings)
+    cache = _open_embedding_cache(provider)
+    pending: list[tuple[Path, str, ChunkingResult]] = []
+    pending_chunks = pending_tokens = 0
 
-    for file_path in iter_documents(input_dir):
-        try:
-            chunks, tokens = _ingest_file(file_path, fake_embeddings=fake_embeddings)
-            document_count += 1
-            chunk_count += len(chunks)
-            token_count += tokens
-            console.log(f"[green]✓[/green] Ingested {file_path} → {len(chunks)} chunks")
-        except Exception as exc:
-            failed_files.append((file_path, str(exc)))
-            console.log(f"[red]✗[/red] Failed to ingest {file_path}: {exc}")
+    progress = Progress(transient=True, refresh_per_second=5, console=console)
+    try:
+        with progress:
+            task = progress.add_task("Ingesting", total=None)
+            for file_path, prepared in _prepare_all(iter_documents(input_dir)):
+                if isinstance(prepared, Exception):
+                    failed_files.append((file_path, str(prepared)))
+                    console.log(f"[red]✗[/red] Failed to ingest {file_path}: {prepared}")
+                    progress.advance(task)
+                    continue
+                document_id, result = prepared
+                pending.append((file_path, document_id, result))
+                pending_chunks += len(result.chunks)
+                pending_tokens += _embedded_tokens(result)
+                if (
+                    pending_chunks >= SETTINGS.embed_batch_size
+                    or pending_tokens >= SETTINGS.embed_batch_max_tokens
+                ):
+                    docs, chunks, tokens = _embed_batch(pending, provider, cache, failed_files)
+                    document_count += docs
+                    chunk_count += chunks
+                    token_count += tokens
+                    progress.advance(task, len(pending))
+                    pending, pending_chunks, pending_tokens = [], 0, 0
+            if pending:
+                docs, chunks, tokens = _embed_batch(pending, provider, cache, failed_files)
+                document_count += docs
+                chunk_count += chunks
+                token_count += tokens
+                progress.advance(task, len(pending))
+    finally:
+        if cache is not None:
+            cache.close()
 
-    end = datetime.now(UTC)
+    end = start + timedelta(seconds=time.perf_counter() - started)
     summary = IngestionSummary(
         document_count=document_count,
         chunk_count=chunk_count,
@@ -120,4 +317,6 @@ def _print_summary(summary: IngestionSummary) -> None:
     table.add_row("Tokens", str(summary.token_count))
     table.add_row("Started", summary.started_at.isoformat())
     table.add_row("Finished", summary.finished_at.isoformat())
+    duration = summary.finished_at - summary.started_at
+    table.add_row("Duration", f"{duration.total_seconds():.2f}s")
     console.print(table)
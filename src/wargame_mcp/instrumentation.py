@@ -3,34 +3,82 @@
 from __future__ import annotations
 
 import logging
+import os
+import sys
 import time
-import uuid
-from collections import defaultdict
 from contextlib import contextmanager
-from contextvars import ContextVar
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass, field
 from threading import Lock
-from typing import Any
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 try:  # pragma: no cover - optional dependency
     import structlog  # type: ignore
 except Exception:  # pragma: no cover - fallback to bundled shim
     from . import _structlog_fallback as structlog
 
+try:  # pragma: no cover - optional dependency
+    import orjson
+except Exception:  # pragma: no cover - stdlib JSON rendering
+    orjson = None  # type: ignore
+
+
+_T = TypeVar("_T")
 
 _correlation_id: ContextVar[str | None] = ContextVar("correlation_id", default=None)
 
+_stack_info_renderer = structlog.processors.StackInfoRenderer()
+
+_package_logger = logging.getLogger("wargame_mcp")
+
+
+def info_enabled() -> bool:
+    """Whether INFO events would be emitted; lets hot paths skip building them.
+
+    ``Logger.isEnabledFor`` caches its answer until levels change, so this stays cheap.
+    """
+
+    return _package_logger.isEnabledFor(logging.INFO)
+
+
+def _render_exceptions(logger: Any, method_name: str, event_dict: dict[str, Any]) -> Any:
+    """Run the stack/traceback renderers only for events that request them."""
+
+    if "stack_info" in event_dict or "exc_info" in event_dict:
+        event_dict = _stack_info_renderer(logger, method_name, event_dict)
+        event_dict = structlog.processors.format_exc_info(logger, method_name, event_dict)
+    return event_dict
+
 
 def _configure_structlog() -> None:
-    logging.basicConfig(level=logging.INFO)
+    processors = [
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.add_log_level,
+        _render_exceptions,
+    ]
+    if _package_logger.level == logging.NOTSET:
+        # The package logger's level is the one switch info_enabled and every backend obey
+        _package_logger.setLevel(logging.INFO)
+    if not hasattr(structlog, "PrintLoggerFactory"):
+        # The bundled shim logs through stdlib logging to a stderr handler
+        structlog.configure()
+        return
+    # stdout carries the MCP stdio protocol, so events always go to stderr
+    if orjson is not None:  # pragma: no cover - optional dependency
+        # orjson renders bytes that are written without building a logging.LogRecord
+        renderer = structlog.processors.JSONRenderer(serializer=orjson.dumps)
+        logger_factory = structlog.BytesLoggerFactory(file=sys.stderr.buffer)
+    else:  # pragma: no cover - optional dependency
+        renderer = structlog.processors.JSONRenderer()
+        logger_factory = structlog.PrintLoggerFactory(file=sys.stderr)
     structlog.configure(
-        processors=[
-            structlog.contextvars.merge_contextvars,
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.add_log_level,
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer(),
-        ],
+        processors=[*processors, renderer],
+        wrapper_class=structlog.make_filtering_bound_logger(_package_logger.level),
+        logger_factory=logger_factory,
         context_class=dict,
         cache_logger_on_first_use=True,
     )
@@ -48,41 +96,72 @@ def get_logger():
 logger = get_logger()
 
 
+@dataclass(slots=True)
+class _LatencyEntry:
+    """Counters for one operation; durations are kept as integer nanoseconds."""
+
+    count: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+    errors: int = 0
+    lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+
 class LatencyRecorder:
-    """In-memory aggregation of latency metrics."""
+    """In-memory aggregation of latency metrics.
+
+    Each operation has its own lock, so concurrent tools only contend when they record
+    the same operation; the registry lock is taken once per new operation name.
+    """
 
     def __init__(self) -> None:
         self._lock = Lock()
-        self._latencies: dict[str, dict[str, float]] = defaultdict(
-            lambda: {"count": 0.0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0.0}
-        )
-
-    def observe(self, name: str, duration_ms: float, *, error: bool) -> None:
-        with self._lock:
-            entry = self._latencies[name]
-            entry["count"] += 1
-            entry["total_ms"] += duration_ms
-            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+        self._latencies: dict[str, _LatencyEntry] = {}
+
+    def _stats(self, name: str) -> _LatencyEntry:
+        stats = self._latencies.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._latencies.setdefault(name, _LatencyEntry())
+        return stats
+
+    def observe(self, name: str, duration_ns: int, *, error: bool) -> None:
+        stats = self._stats(name)
+        with stats.lock:
+            stats.count += 1
+            stats.total_ns += duration_ns
+            if duration_ns > stats.max_ns:
+                stats.max_ns = duration_ns
             if error:
-                entry["errors"] += 1
+                stats.errors += 1
 
     def summary(self) -> dict[str, dict[str, float]]:
-        with self._lock:
-            snapshot: dict[str, dict[str, float]] = {}
-            for name, entry in self._latencies.items():
-                avg = entry["total_ms"] / entry["count"] if entry["count"] else 0.0
-                snapshot[name] = {
-                    "count": entry["count"],
-                    "avg_ms": avg,
-                    "max_ms": entry["max_ms"],
-                    "errors": entry["errors"],
-                }
-            return snapshot
+        snapshot: dict[str, dict[str, float]] = {}
+        for name, stats in list(self._latencies.items()):
+            with stats.lock:
+                count, total_ns, max_ns, errors = (
+                    stats.count,
+                    stats.total_ns,
+                    stats.max_ns,
+                    stats.errors,
+                )
+            snapshot[name] = {
+                "count": float(count),
+                "avg_ms": total_ns / count / 1_000_000 if count else 0.0,
+                "max_ms": max_ns / 1_000_000,
+                "errors": float(errors),
+            }
+        return snapshot
 
 
 latencies = LatencyRecorder()
 
 
+def new_correlation_id() -> str:
+    # 64 random bits are plenty for correlating calls and skip building a UUID object
+    return os.urandom(8).hex()
+
+
 @contextmanager
 def correlation_scope(correlation_id: str | None = None):
     """Context manager that ensures a correlation id is propagated."""
@@ -91,7 +170,11 @@ def correlation_scope(correlation_id: str | None = None):
     if correlation_id is None:
         correlation_id = current
     if correlation_id is None:
-        correlation_id = uuid.uuid4().hex
+        correlation_id = new_correlation_id()
+    elif correlation_id == current:
+        # Nested scopes (e.g. tool helpers) inherit the id; no set/reset round-trip needed
+        yield correlation_id
+        return
     token = _correlation_id.set(correlation_id)
     try:
         yield correlation_id
@@ -99,6 +182,30 @@ def correlation_scope(correlation_id: str | None = None):
         _correlation_id.reset(token)
 
 
+def correlation_scope_set(
+    correlation_id: str | None, func: Callable[..., _T], /, *args: Any, **kwargs: Any
+) -> _T:
+    """Bind ``correlation_id`` in the current context and call ``func``.
+
+    Nothing is reset, so use this only where the context is a private copy that is
+    discarded afterwards, such as ``asyncio.to_thread`` workers.
+    """
+
+    _correlation_id.set(correlation_id or _correlation_id.get() or new_correlation_id())
+    return func(*args, **kwargs)
+
+
+def correlation_scope_run(
+    correlation_id: str | None, func: Callable[..., _T], /, *args: Any, **kwargs: Any
+) -> _T:
+    """Call ``func`` in a copied context bound to ``correlation_id``.
+
+    The copy is discarded afterwards, so nothing has to be reset.
+    """
+
+    return copy_context().run(correlation_scope_set, correlation_id, func, *args, **kwargs)
+
+
 def get_correlation_id() -> str | None:
     return _correlation_id.get()
 
@@ -107,7 +214,7 @@ def get_correlation_id() -> str | None:
 def track_latency(operation: str, **fields: Any):
     """Record latency metrics and log them as JSON events."""
 
-    start = time.perf_counter()
+    start = time.perf_counter_ns()
     error = False
     try:
         yield
@@ -115,13 +222,14 @@ def track_latency(operation: str, **fields: Any):
         error = True
         raise
     finally:
-        duration_ms = (time.perf_counter() - start) * 1000
-        latencies.observe(operation, duration_ms, error=error)
-        logger.info(
-            "latency",
-            operation=operation,
-            latency_ms=duration_ms,
-            error=error,
-            correlation_id=get_correlation_id(),
-            **fields,
-        )
+        duration_ns = time.perf_counter_ns() - start
+        latencies.observe(operation, duration_ns, error=error)
+        if info_enabled():
+            logger.info(
+                "latency",
+                operation=operation,
+                latency_ms=duration_ns / 1_000_000,
+                error=error,
+                correlation_id=_correlation_id.get(),
+                **fields,
+            )
@@ -9,10 +9,12 @@ without having to spin up an MCP runtime.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from itertools import chain
 from typing import TYPE_CHECKING, Any
 
 from .embeddings import build_embedding_provider
-from .vectorstore import SearchResult, get_collection, query
+from .instrumentation import correlation_scope, track_latency
+from .vectorstore import SearchResult, collection_document_counts, get_collection, query
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
@@ -35,17 +37,21 @@ def search_wargame_documents(
     min_score: float = 0.0,
     collections: Iterable[str] | None = None,
     fake_embeddings: bool = False,
+    correlation_id: str | None = None,
 ) -> ToolResult:
     """Run a semantic search over the stored chunks."""
 
-    provider = build_embedding_provider(fake=fake_embeddings)
-    hits = query(
-        query_text=query_text,
-        top_k=top_k,
-        min_score=min_score,
-        collections=list(collections) if collections else None,
-        embedding_provider=provider,
-    )
+    with correlation_scope(correlation_id), track_latency(
+        "search_wargame_docs", tool_name="search_wargame_docs", top_k=top_k
+    ):
+        provider = build_embedding_provider(fake=fake_embeddings)
+        hits = query(
+            query_text=query_text,
+            top_k=top_k,
+            min_score=min_score,
+            collections=list(collections) if collections else None,
+            embedding_provider=provider,
+        )
     serialized = [_serialize_search_hit(hit) for hit in hits]
     return ToolResult(results=serialized)
 
@@ -55,17 +61,31 @@ def get_document_span(
     document_id: str,
     center_chunk_index: int,
     span: int = 2,
+    correlation_id: str | None = None,
 ) -> dict[str, Any]:
     """Return neighbouring chunks around a given hit."""
 
     if span < 0:
         raise ValueError("span must be >= 0")
 
-    collection = get_collection()
-    raw = collection.get(
-        where={"document_id": document_id},
-        include=["documents", "metadatas"],
-    )
+    start = max(0, center_chunk_index - span)
+    end = center_chunk_index + span
+
+    # Only the requested window crosses the Chroma boundary, not the whole document
+    with correlation_scope(correlation_id), track_latency(
+        "get_doc_span", tool_name="get_doc_span", document_id=document_id, span=span
+    ):
+        collection = get_collection()
+        raw = collection.get(
+            where={
+                "$and": [
+                    {"document_id": document_id},
+                    {"chunk_index": {"$gte": start}},
+                    {"chunk_index": {"$lte": end}},
+                ]
+            },
+            include=["documents", "metadatas"],
+        )
     chunks = []
     ids = _flatten(raw.get("ids", []))
     documents = _flatten(raw.get("documents", []))
@@ -87,30 +107,22 @@ def get_document_span(
     if not chunks:
         return {"chunks": []}
 
+    # Chroma does not guarantee result order; sorting the window is cheap
     chunks.sort(key=lambda item: item["chunk_index"])
-    start = max(0, center_chunk_index - span)
-    end = center_chunk_index + span
-
-    window = [chunk for chunk in chunks if start <= chunk["chunk_index"] <= end]
-    return {"chunks": window}
+    return {"chunks": chunks}
 
 
 def list_collections_summary() -> dict[str, Any]:
-    """Aggregate metadata counts per collection."""
+    """Aggregate document counts per collection.
 
-    collection = get_collection()
-    agg: dict[str, set[str]] = {}
-    result = collection.get(include=["metadatas"])
-    for metadata in _flatten(result.get("metadatas", [])):
-        name = metadata.get("collection", "other")
-        doc_id = metadata.get("document_id")
-        if doc_id is None:
-            continue
-        agg.setdefault(name, set()).add(doc_id)
+    Counts come from an index built from each document's first chunk and kept up to date
+    by upserts and deletes, so repeated calls do not rescan the store.
+    """
 
+    counts = collection_document_counts(get_collection())
     summaries = [
-        {"name": name, "document_count": len(doc_ids), "description": ""}
-        for name, doc_ids in sorted(agg.items())
+        {"name": name, "document_count": count, "description": ""}
+        for name, count in sorted(counts.items())
     ]
     return {"collections": summaries}
 
@@ -124,23 +136,13 @@ def health_check_status() -> dict[str, Any]:
 
 
 def _serialize_search_hit(hit: SearchResult) -> dict[str, Any]:
-    metadata = dict(hit.metadata)
-    return {
-        "id": hit.id,
-        "text": hit.text,
-        "score": hit.score,
-        "metadata": metadata,
-    }
+    return {"id": hit.id, "text": hit.text, "score": hit.score, "metadata": dict(hit.metadata)}
 
 
 def _flatten(value: Any) -> list[Any]:
+    # Chroma results are either flat or nested exactly once, never mixed
     if not isinstance(value, list):
         return [value]
-    if not value:
-        return []
-    if isinstance(value[0], list):
-        flattened: list[Any] = []
-        for item in value:
-            flattened.extend(item if isinstance(item, list) else [item])
-        return flattened
+    if value and isinstance(value[0], list):
+        return list(chain.from_iterable(value))
     return value
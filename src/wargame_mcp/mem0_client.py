@@ -7,6 +7,7 @@ from dataclasses import dataclass, field
 from threading import Lock
 from typing import TYPE_CHECKING, Any
 
+from ._json_compat import dumps_bytes, loads
 from .config import SETTINGS
 from .instrumentation import get_correlation_id, logger
 
@@ -14,6 +15,10 @@ if TYPE_CHECKING:
     from collections.abc import Iterable
 
 
+# httpx only negotiates HTTP/2 when the optional ``h2`` package is installed
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
 class Mem0Error(RuntimeError):
     """Raised when the Mem0 backend returns an error response."""
 
@@ -34,7 +39,17 @@ class Mem0Client:
             raise ValueError("mem0 base url must be configured")
         self.base_url = base
         self._httpx = self._import_httpx()
-        self._client = self._httpx.Client(base_url=self.base_url, timeout=self.timeout)
+        # One pooled keep-alive client per Mem0Client; get_mem0_client shares the instance
+        self._client = self._httpx.Client(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            http2=_HTTP2_AVAILABLE,
+            limits=self._httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+
+    def close(self) -> None:
+        """Close pooled connections held by the underlying HTTP client."""
+        self._client.close()
 
     # --- public helpers -------------------------------------------------
     def memory_search(
@@ -106,13 +121,19 @@ class Mem0Client:
     ) -> dict[str, Any]:
         if not path.startswith("/"):
             path = "/" + path
+        headers = self._headers()
+        content = None
+        if json is not None:
+            # Encode the body ourselves so orjson is used when installed
+            content = dumps_bytes(json)
+            headers["Content-Type"] = "application/json"
         try:
             response = self._client.request(
                 method,
                 path,
-                json=json,
+                content=content,
                 params=params,
-                headers=self._headers(),
+                headers=headers,
             )
             response.raise_for_status()
         except self._httpx.HTTPStatusError as exc:  # pragma: no cover - network failure
@@ -131,7 +152,8 @@ class Mem0Client:
             raise Mem0Error(f"Mem0 request error: {exc}") from exc
 
         try:
-            data = response.json()
+            # Parse the raw bytes directly instead of httpx's decode-then-json.loads
+            data = loads(response.content)
         except ValueError as exc:  # pragma: no cover - depends on remote response
             raise Mem0Error("Mem0 response did not contain valid JSON") from exc
         return data if isinstance(data, dict) else {"results": data}
@@ -159,16 +181,17 @@ def build_mem0_client() -> Mem0Client:
 def get_mem0_client() -> Mem0Client:
     """Thread-safe singleton accessor for the Mem0 client."""
     global _mem0_client
-    if _mem0_client is None:
-        with _mem0_client_lock:
-            # Double-check pattern
-            if _mem0_client is None:
-                _mem0_client = build_mem0_client()
-    return _mem0_client
+    client = _mem0_client
+    if client is not None:
+        return client
+    # Only first use takes the lock, so concurrent callers never build two connection pools
+    with _mem0_client_lock:
+        if _mem0_client is None:
+            _mem0_client = build_mem0_client()
+        return _mem0_client
 
 
 def set_mem0_client(client: Mem0Client | None) -> None:
-    """Thread-safe setter for the Mem0 client (used in tests)."""
+    """Replace the shared Mem0 client (used in tests); a single global store is atomic."""
     global _mem0_client
-    with _mem0_client_lock:
-        _mem0_client = client
+    _mem0_client = client
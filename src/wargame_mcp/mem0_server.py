@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING, Any
 
+from .instrumentation import correlation_scope_set, info_enabled, logger, new_correlation_id
 from .memory_tools import (
     memory_add_entry,
     memory_delete_entry,
@@ -17,7 +19,7 @@ except Exception:  # pragma: no cover
     FastMCP = None  # type: ignore
 
 if TYPE_CHECKING:  # pragma: no cover
-    from collections.abc import Iterable
+    from collections.abc import Callable, Hashable, Iterable
 
     from mcp.server.fastmcp import FastMCP as FastMCPType
 
@@ -25,6 +27,39 @@ if TYPE_CHECKING:  # pragma: no cover
 SERVER_NAME = "mem0-mcp"
 
 
+class InFlightCoalescer:
+    """Share one worker-thread call between identical concurrent read requests.
+
+    Callers that arrive while a call with the same key is running await its result
+    instead of issuing another Mem0 round-trip. The shared call's downstream events
+    carry only the leader's ``correlation_id``, so each coalesced caller logs a
+    ``coalesced`` event linking its own id to the leader's.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[Hashable, tuple[asyncio.Future[Any], str | None]] = {}
+
+    async def run(self, key: Hashable, func: Callable[..., Any], /, **kwargs: Any) -> Any:
+        correlation_id = kwargs.get("correlation_id")
+        pending = self._pending.get(key)
+        if pending is not None:
+            task, leader_id = pending
+            if info_enabled():
+                logger.info(
+                    "coalesced",
+                    operation=getattr(func, "__name__", None),
+                    correlation_id=correlation_id,
+                    leader_correlation_id=leader_id,
+                )
+            return await asyncio.shield(task)
+        task = asyncio.ensure_future(
+            asyncio.to_thread(correlation_scope_set, correlation_id, func, **kwargs)
+        )
+        self._pending[key] = (task, correlation_id)
+        task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+
 def create_server() -> FastMCPType:
     if FastMCP is None:  # pragma: no cover - depends on optional dependency
         raise RuntimeError(
@@ -32,7 +67,12 @@ def create_server() -> FastMCPType:
         )
 
     server = FastMCP(SERVER_NAME)
+    searches = InFlightCoalescer()
 
+    # Mem0 calls are blocking HTTP requests; running them on worker threads keeps the
+    # event loop free so concurrent tool calls overlap on the shared connection pool.
+    # to_thread already runs each call in a copied context; correlation_scope_set binds
+    # the id there once, so the tool helpers' own scopes reuse it without a set/reset.
     @server.tool()
     async def memory_search(
         query: str,
@@ -41,12 +81,16 @@ def create_server() -> FastMCPType:
         scopes: Iterable[str] | None = None,
         correlation_id: str | None = None,
     ) -> dict[str, Any]:
-        return memory_search_entries(
+        scope_key = tuple(scopes) if scopes is not None else None
+        # Resolve the id up front so a coalesced caller can name the leader it joined
+        return await searches.run(
+            (query, user_id, limit, scope_key),
+            memory_search_entries,
             query=query,
             user_id=user_id,
             limit=limit,
-            scopes=scopes,
-            correlation_id=correlation_id,
+            scopes=scope_key,
+            correlation_id=correlation_id or new_correlation_id(),
         )
 
     @server.tool()
@@ -58,7 +102,10 @@ def create_server() -> FastMCPType:
         source: str | None = None,
         correlation_id: str | None = None,
     ) -> dict[str, Any]:
-        return memory_add_entry(
+        return await asyncio.to_thread(
+            correlation_scope_set,
+            correlation_id,
+            memory_add_entry,
             user_id=user_id,
             memory=memory,
             scope=scope,
@@ -69,7 +116,13 @@ def create_server() -> FastMCPType:
 
     @server.tool()
     async def memory_delete(memory_id: str, correlation_id: str | None = None) -> dict[str, Any]:
-        return memory_delete_entry(memory_id=memory_id, correlation_id=correlation_id)
+        return await asyncio.to_thread(
+            correlation_scope_set,
+            correlation_id,
+            memory_delete_entry,
+            memory_id=memory_id,
+            correlation_id=correlation_id,
+        )
 
     @server.tool()
     async def memory_list(
@@ -79,7 +132,10 @@ def create_server() -> FastMCPType:
         tags: Iterable[str] | None = None,
         correlation_id: str | None = None,
     ) -> dict[str, Any]:
-        return memory_list_entries(
+        return await asyncio.to_thread(
+            correlation_scope_set,
+            correlation_id,
+            memory_list_entries,
             user_id=user_id,
             limit=limit,
             scope=scope,
@@ -5,7 +5,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 from .config import SETTINGS
-from .instrumentation import correlation_scope, logger, track_latency
+from .instrumentation import correlation_scope, info_enabled, logger, track_latency
 from .mem0_client import get_mem0_client
 
 if TYPE_CHECKING:
@@ -13,6 +13,12 @@ if TYPE_CHECKING:
 
 DEFAULT_SCOPES = ["user", "scenario", "agent"]
 
+# Bound once so each completion event skips re-merging the constant tool name
+_SEARCH_LOG = logger.bind(tool_name="memory_search")
+_ADD_LOG = logger.bind(tool_name="memory_add")
+_DELETE_LOG = logger.bind(tool_name="memory_delete")
+_LIST_LOG = logger.bind(tool_name="memory_list")
+
 
 def memory_search_entries(
     *,
@@ -46,12 +52,12 @@ def memory_search_entries(
                 limit=limit,
                 scopes=scope_filters,
             )
-        logger.info(
-            "tool_call.complete",
-            tool_name="memory_search",
-            correlation_id=cid,
-            result_count=len(results),
-        )
+        if info_enabled():
+            _SEARCH_LOG.info(
+                "tool_call.complete",
+                correlation_id=cid,
+                result_count=len(results),
+            )
         return {"results": results}
 
 
@@ -80,12 +86,12 @@ def memory_add_entry(
                 tags=tags,
                 source=source,
             )
-        logger.info(
-            "tool_call.complete",
-            tool_name="memory_add",
-            correlation_id=cid,
-            memory_id=payload.get("memory_id"),
-        )
+        if info_enabled():
+            _ADD_LOG.info(
+                "tool_call.complete",
+                correlation_id=cid,
+                memory_id=payload.get("memory_id"),
+            )
         return payload
 
 
@@ -100,12 +106,12 @@ def memory_delete_entry(
         with track_latency("memory_delete", tool_name="memory_delete", memory_id=memory_id):
             client = get_mem0_client()
             payload = client.memory_delete(memory_id=memory_id)
-        logger.info(
-            "tool_call.complete",
-            tool_name="memory_delete",
-            correlation_id=cid,
-            status=payload.get("status"),
-        )
+        if info_enabled():
+            _DELETE_LOG.info(
+                "tool_call.complete",
+                correlation_id=cid,
+                status=payload.get("status"),
+            )
         return payload
 
 
@@ -134,10 +140,10 @@ def memory_list_entries(
         ):
             client = get_mem0_client()
             results = client.memory_list(user_id=user_id, limit=limit, scope=scope, tags=tags)
-        logger.info(
-            "tool_call.complete",
-            tool_name="memory_list",
-            correlation_id=cid,
-            result_count=len(results),
-        )
+        if info_enabled():
+            _LIST_LOG.info(
+                "tool_call.complete",
+                correlation_id=cid,
+                result_count=len(results),
+            )
         return {"results": results}
@@ -3,47 +3,82 @@
 from __future__ import annotations
 
 import importlib.util
+import os
+from dataclasses import replace
+from functools import lru_cache
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any
 
 if importlib.util.find_spec("yaml") is not None:
     import yaml  # type: ignore  # pragma: no cover - optional dependency
+
+    # libyaml's C scanner when PyYAML was built with it; same safe semantics either way
+    _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 else:  # pragma: no cover - fallback when PyYAML is unavailable
     yaml = None
 
 from .documents import DocumentMetadata, build_document_id, ensure_year, merge_tags
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
     from pathlib import Path
 
-COLLECTIONS = {"doctrine", "aar", "scenario", "intel", "other"}
+_SIDECAR_SUFFIX = ".meta.yml"
+
+COLLECTIONS = frozenset({"doctrine", "aar", "scenario", "intel", "other"})
+
+_NO_METADATA: Mapping[str, Any] = MappingProxyType({})
 
 
 def _load_yaml(path: Path) -> dict[str, Any] | None:
-    if yaml is None or not path.exists():
+    if yaml is None:
         return None
     try:
-        data = yaml.safe_load(path.read_text(encoding="utf-8"))
+        # Raw bytes go straight to the scanner, which detects the encoding itself
+        data = yaml.load(path.read_bytes(), Loader=_YAML_LOADER)
         return data or {}
-    except Exception:
+    except (OSError, yaml.YAMLError):
+        # Missing or unreadable sidecars and malformed or unsafe YAML all mean "no metadata"
         return None
 
 
+def _stat_signature(path: str) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 def metadata_for_document(doc_path: Path) -> DocumentMetadata:
-    yaml_path = doc_path.with_suffix(doc_path.suffix + ".meta.yml")
-    yaml_data = _load_yaml(yaml_path)
+    # Metadata depends only on the path and its sidecar, so unchanged sidecars skip YAML
+    # parsing. The cache hit path only formats a string and stats it; the sidecar Path is
+    # built on a miss.
+    signature = _stat_signature(f"{doc_path}{_SIDECAR_SUFFIX}")
+    cached = _cached_metadata(doc_path, signature)
+    return replace(cached, tags=list(cached.tags))
+
+
+@lru_cache(maxsize=8192)
+def _cached_metadata(doc_path: Path, yaml_signature: tuple[int, int] | None) -> DocumentMetadata:
+    # A failed stat already proved the sidecar is absent; don't try to open it
+    yaml_data = None
+    if yaml_signature is not None:
+        yaml_data = _load_yaml(doc_path.with_name(doc_path.name + _SIDECAR_SUFFIX))
+    meta = yaml_data or _NO_METADATA
 
-    title = yaml_data.get("title") if yaml_data else doc_path.stem.replace("_", " ")
-    document_id = yaml_data.get("document_id") if yaml_data else None
+    title = meta.get("title") if yaml_data else doc_path.stem.replace("_", " ")
+    document_id = meta.get("document_id")
     if not document_id:
         document_id = build_document_id(doc_path, title=title)
 
-    collection = (yaml_data or {}).get("collection", "other")
+    collection = meta.get("collection", "other")
     if collection not in COLLECTIONS:
         collection = "other"
 
-    year = ensure_year((yaml_data or {}).get("year"))
-    doctrine = (yaml_data or {}).get("doctrine")
-    tags = merge_tags((yaml_data or {}).get("tags", []))
+    year = ensure_year(meta.get("year"))
+    doctrine = meta.get("doctrine")
+    tags = merge_tags(meta.get("tags", []))
 
     return DocumentMetadata(
         document_id=document_id,
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING, Any
 
+from .instrumentation import correlation_scope_set
 from .mcp_tools import (
     get_document_span,
     health_check_status,
@@ -41,39 +43,54 @@ def create_server() -> FastMCPType:
         top_k: int = 8,
         min_score: float = 0.0,
         collections: Iterable[str] | None = None,
+        correlation_id: str | None = None,
     ) -> dict[str, Any]:
         """Mirror of the search_wargame_docs MCP tool."""
 
-        return search_wargame_documents(
+        # Embedding and vector search block; run them off the event loop so calls overlap.
+        # to_thread copies the context, so binding the id there needs no further copy.
+        result = await asyncio.to_thread(
+            correlation_scope_set,
+            correlation_id,
+            search_wargame_documents,
             query_text=query,
             top_k=top_k,
             min_score=min_score,
             collections=collections,
-        ).as_dict()
+            correlation_id=correlation_id,
+        )
+        return result.as_dict()
 
     @server.tool()
     async def get_doc_span(
         document_id: str,
         center_chunk_index: int,
         span: int = 2,
+        correlation_id: str | None = None,
     ) -> dict[str, Any]:
         """Fetch the textual neighbourhood for a chunk."""
 
-        return get_document_span(
-            document_id=document_id, center_chunk_index=center_chunk_index, span=span
+        return await asyncio.to_thread(
+            correlation_scope_set,
+            correlation_id,
+            get_document_span,
+            document_id=document_id,
+            center_chunk_index=center_chunk_index,
+            span=span,
+            correlation_id=correlation_id,
         )
 
     @server.tool()
     async def list_collections() -> dict[str, Any]:
         """List every collection with aggregated counts."""
 
-        return list_collections_summary()
+        return await asyncio.to_thread(list_collections_summary)
 
     @server.tool()
     async def health_check() -> dict[str, Any]:
         """Ping the Chroma backend."""
 
-        return health_check_status()
+        return await asyncio.to_thread(health_check_status)
 
     return server
 
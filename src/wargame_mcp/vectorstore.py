@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
+import heapq
 import importlib.util
+import math
+import os
+import time
+from array import array
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import mul
+from threading import Lock
 from typing import TYPE_CHECKING, Any
 
+from ._vecmath import l2_normalize, quantize_int8
 from .config import SETTINGS
+from .documents import ChunkBatch
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable, Sequence
 
     from .documents import DocumentChunk
 
@@ -45,35 +55,194 @@ def _identity_embedding_function(chromadb_module: Any) -> Any:
     return IdentityEmbeddingFunction()
 
 
-def _client():
+@lru_cache(maxsize=4)
+def _persistent_client(path: str):
+    # One client per persist directory; the mkdir runs once, not per collection lookup
     chromadb = _import_chromadb()
-    SETTINGS.chroma_path.mkdir(parents=True, exist_ok=True)
-    return chromadb.PersistentClient(path=SETTINGS.chroma_path_str)
+    os.makedirs(path, exist_ok=True)
+    return chromadb.PersistentClient(path=path)
+
+
+def _client():
+    return _persistent_client(SETTINGS.chroma_path_str)
+
+
+def _collection_metadata() -> dict[str, Any]:
+    """HNSW settings for newly created collections.
+
+    ``M`` and ``construction_ef`` trade index size and build time for recall;
+    ``search_ef`` trades query latency for recall and can be lowered for small ``top_k``.
+    They only take effect when the collection is first created. Vectors are
+    L2-normalized before they are stored or queried, so inner product equals cosine.
+    """
+    return {
+        "hnsw:space": "ip",
+        "hnsw:M": SETTINGS.hnsw_m,
+        "hnsw:construction_ef": SETTINGS.hnsw_ef_construction,
+        "hnsw:search_ef": SETTINGS.hnsw_ef_search,
+    }
+
+
+UPSERT_BATCH_SIZE = 512
+
+# (chroma path, collection name) -> handle; opening a PersistentClient is not free, so the
+# handle is reused across tool calls until the configured location changes.
+_cached_collection: tuple[tuple[str, str], Any] | None = None
+_collection_lock = Lock()
 
 
 def get_collection():
+    global _cached_collection
     if _use_fallback_store():
         return _FallbackCollection()
-    client = _client()
-    return client.get_or_create_collection(
-        name=SETTINGS.chroma_collection,
-        embedding_function=_identity_embedding_function(_import_chromadb()),
-        metadata={"hnsw:space": "cosine"},
-    )
+    key = (SETTINGS.chroma_path_str, SETTINGS.chroma_collection)
+    cached = _cached_collection
+    if cached is None or cached[0] != key:
+        with _collection_lock:
+            cached = _cached_collection
+            if cached is None or cached[0] != key:
+                collection = _client().get_or_create_collection(
+                    name=SETTINGS.chroma_collection,
+                    embedding_function=_identity_embedding_function(_import_chromadb()),
+                    metadata=_collection_metadata(),
+                )
+                cached = _cached_collection = (key, collection)
+    return cached[1]
 
 
+# Exact brute-force store used only when chromadb is not installed (tests, minimal
+# installs). Approximate search belongs to Chroma's HNSW index configured above; this
+# store stays exhaustive so its results are deterministic.
 _fallback_store: list[dict[str, Any]] = []
 
+# document_id -> rows of the store it was built from; writers drop it after mutating,
+# readers rebuild it. Both hold _fallback_lock so a rebuild never sees a half-written store.
+_fallback_documents: tuple[list[dict[str, Any]], dict[str, list[dict[str, Any]]]] | None = None
+_fallback_lock = Lock()
+
+
+def _fallback_rows_by_document() -> dict[str, list[dict[str, Any]]]:
+    global _fallback_documents
+    cached = _fallback_documents
+    if cached is not None and cached[0] is _fallback_store:
+        return cached[1]
+    with _fallback_lock:
+        cached = _fallback_documents
+        if cached is not None and cached[0] is _fallback_store:
+            return cached[1]
+        rows: dict[str, list[dict[str, Any]]] = {}
+        for entry in _fallback_store:
+            rows.setdefault(entry["metadata"].get("document_id"), []).append(entry)
+        _fallback_documents = (_fallback_store, rows)
+        return rows
+
+
+def _invalidate_fallback_documents() -> None:
+    """Drop the per-document index; call with ``_fallback_lock`` held, after mutating."""
+    global _fallback_documents
+    _fallback_documents = None
+
+
+def _where_document_id(where: dict[str, Any]) -> str | None:
+    """The document a ``where`` clause is pinned to, if any (directly or under ``$and``)."""
+    value = where.get("document_id")
+    if isinstance(value, dict) and len(value) == 1:
+        value = value.get("$eq")
+    if isinstance(value, str):
+        return value
+    for clause in where.get("$and", ()):
+        found = _where_document_id(clause)
+        if found is not None:
+            return found
+    return None
+
+_WHERE_OPERATORS = {
+    "$eq": lambda value, operand: value == operand,
+    "$ne": lambda value, operand: value != operand,
+    "$gt": lambda value, operand: value is not None and value > operand,
+    "$gte": lambda value, operand: value is not None and value >= operand,
+    "$lt": lambda value, operand: value is not None and value < operand,
+    "$lte": lambda value, operand: value is not None and value <= operand,
+    "$in": lambda value, operand: value in operand,
+    "$nin": lambda value, operand: value not in operand,
+}
+
+
+def _membership_operand(operand: Iterable[Any]) -> frozenset[Any] | tuple[Any, ...]:
+    try:
+        return frozenset(operand)
+    except TypeError:  # unhashable operands keep the linear scan
+        return tuple(operand)
+
+
+def _compile_operator(op: str, operand: Any) -> Callable[[Any], bool]:
+    if op in ("$in", "$nin"):
+        members = _membership_operand(operand)
+        negate = op == "$nin"
+
+        def contains(value: Any) -> bool:
+            try:
+                return (value in members) != negate
+            except TypeError:  # unhashable value against a set operand never matches
+                return negate
+
+        return contains
+    compare = _WHERE_OPERATORS[op]
+    return lambda value: compare(value, operand)
+
+
+def _compile_field(key: str, condition: Any) -> Callable[[dict[str, Any]], bool]:
+    if not isinstance(condition, dict):
+        return lambda metadata: metadata.get(key) == condition
+    tests = [_compile_operator(op, operand) for op, operand in condition.items()]
+
+    def check(metadata: dict[str, Any]) -> bool:
+        value = metadata.get(key)
+        return all(test(value) for test in tests)
+
+    return check
+
+
+def _compile_where(where: dict[str, Any]) -> Callable[[dict[str, Any]], bool]:
+    """Compile the subset of Chroma's ``where`` syntax used by this package to a predicate.
+
+    The clause tree is walked once per query instead of once per stored row.
+    """
+    checks: list[Callable[[dict[str, Any]], bool]] = []
+    for key, condition in where.items():
+        if key in ("$and", "$or"):
+            clauses = [_compile_where(clause) for clause in condition]
+            combine = all if key == "$and" else any
+            checks.append(
+                lambda metadata, clauses=clauses, combine=combine: combine(
+                    clause(metadata) for clause in clauses
+                )
+            )
+        else:
+            checks.append(_compile_field(key, condition))
+    if len(checks) == 1:
+        return checks[0]
+    return lambda metadata: all(check(metadata) for check in checks)
+
+
+def _matches_where(metadata: dict[str, Any], where: dict[str, Any]) -> bool:
+    """Evaluate ``where`` against a single metadata dict."""
+    return _compile_where(where)(metadata)
+
 
 class _FallbackCollection:
     def get(self, where: dict | None = None, include: list[str] | None = None) -> dict[str, list]:
         include = include or []
         results = {"ids": [], "documents": [], "metadatas": []}
-        for entry in _fallback_store:
-            if where:
-                doc_filter = where.get("document_id")
-                if doc_filter is not None and entry["metadata"].get("document_id") != doc_filter:
-                    continue
+        matches = _compile_where(where) if where else None
+        rows = _fallback_store
+        document_id = _where_document_id(where) if where else None
+        if document_id is not None:
+            # Span lookups pin one document; scan only its rows instead of the whole store
+            rows = _fallback_rows_by_document().get(document_id, [])
+        for entry in rows:
+            if matches is not None and not matches(entry["metadata"]):
+                continue
             results["ids"].append(entry["id"])
             if "documents" in include:
                 results.setdefault("documents", []).append(entry["text"])
@@ -98,13 +267,28 @@ class SearchResult:
     metadata: dict
 
 
-def _cosine_similarity(vector_a: list[float], vector_b: list[float]) -> float:
+def _cosine_similarity(
+    vector_a: Sequence[float],
+    vector_b: Sequence[float],
+    norm_a: float | None = None,
+    norm_b: float | None = None,
+) -> float:
+    """Cosine similarity mapped to 0-1; pass precomputed norms to skip recomputing them."""
     if not vector_a or not vector_b:
         return 0.0
     length = min(len(vector_a), len(vector_b))
-    dot = sum(vector_a[i] * vector_b[i] for i in range(length))
-    norm_a = sum(x * x for x in vector_a[:length]) ** 0.5
-    norm_b = sum(x * x for x in vector_b[:length]) ** 0.5
+    if len(vector_a) != length:
+        vector_a = vector_a[:length]
+        norm_a = None
+    if len(vector_b) != length:
+        vector_b = vector_b[:length]
+        norm_b = None
+    # map/sum and math.hypot run the multiply-adds in C instead of a Python-level loop
+    dot = sum(map(mul, vector_a, vector_b))
+    if norm_a is None:
+        norm_a = math.hypot(*vector_a)
+    if norm_b is None:
+        norm_b = math.hypot(*vector_b)
     if norm_a == 0 or norm_b == 0:
         return 0.0
     # Convert cosine distance to similarity score between 0-1
@@ -112,39 +296,158 @@ def _cosine_similarity(vector_a: list[float], vector_b: list[float]) -> float:
     return max(min((cosine + 1) / 2, 1.0), 0.0)
 
 
-def upsert_chunks(chunks: Iterable[DocumentChunk], embeddings: list[list[float]]) -> None:
+def _split_tags(tags: str) -> list[str]:
+    # upsert_chunks writes tags stripped and comma-joined without blanks
+    return tags.split(",") if tags else []
+
+
+def _cosine_scores(
+    vector: Sequence[float], vector_norm: float, entries: Sequence[dict[str, Any]]
+) -> list[float]:
+    """Score fallback ``entries`` against a query with one fused loop.
+
+    Produces the same values as ``_cosine_similarity`` but skips its per-call branching
+    for the common case of equal lengths and precomputed, non-zero norms.
+    """
+    dims = len(vector)
+    scores: list[float] = []
+    append = scores.append
+    for entry in entries:
+        stored = entry.get("embedding", [])
+        norm = entry.get("norm")
+        if len(stored) != dims or not norm or not vector_norm:
+            append(_cosine_similarity(vector, stored, vector_norm, norm))
+            continue
+        cosine = sum(map(mul, vector, stored)) / (vector_norm * norm)
+        append(max(min((cosine + 1) / 2, 1.0), 0.0))
+    return scores
+
+
+def upsert_chunks(
+    chunks: Iterable[DocumentChunk] | ChunkBatch,
+    embeddings: Iterable[Sequence[float]],
+    batch_size: int = UPSERT_BATCH_SIZE,
+) -> None:
+    batch = chunks if isinstance(chunks, ChunkBatch) else ChunkBatch.from_chunks(chunks)
+    # Any row-iterable works (lists, packed arrays, ndarray rows); normalizing yields lists
+    embeddings = [l2_normalize(vector) for vector in embeddings]
+    metadatas = batch.to_chroma_metadatas(tag_separator=",")
     if _use_fallback_store():
-        _fallback_store.clear()
-        for chunk, vector in zip(chunks, embeddings, strict=False):
-            meta = chunk.chroma_metadata()
-            if isinstance(meta.get("tags"), list):
-                meta["tags"] = ",".join(meta["tags"])
-            _fallback_store.append(
-                {"id": chunk.id, "text": chunk.text, "metadata": meta, "embedding": vector}
-            )
+        if SETTINGS.embedding_quantization == "int8":
+            # Cosine similarity ignores the per-vector scale, so only the int8 values are kept
+            embeddings = [quantize_int8(vector)[0] for vector in embeddings]
+        else:
+            # Packed float32 is 4 bytes per component versus a boxed float per list slot
+            embeddings = [array("f", vector) for vector in embeddings]
+        with _fallback_lock:
+            _fallback_store.clear()
+            for chunk_id, text, meta, vector in zip(
+                batch.ids, batch.texts, metadatas, embeddings, strict=False
+            ):
+                # The norm is fixed once stored, so queries only pay for the dot product
+                _fallback_store.append(
+                    {
+                        "id": chunk_id,
+                        "text": text,
+                        "metadata": meta,
+                        "embedding": vector,
+                        "norm": math.hypot(*vector),
+                    }
+                )
+            _invalidate_fallback_documents()
         return
 
     collection = get_collection()
-    ids: list[str] = []
-    metadatas: list[dict] = []
-    documents: list[str] = []
-    for chunk, _vector in zip(chunks, embeddings, strict=False):
-        ids.append(chunk.id)
-        meta = chunk.chroma_metadata()
-        if isinstance(meta.get("tags"), list):
-            meta["tags"] = ",".join(meta["tags"])
-        metadatas.append(meta)
-        documents.append(chunk.text)
-    collection.upsert(ids=ids, metadatas=metadatas, documents=documents, embeddings=embeddings)
+    # Bounded requests keep Chroma's per-call serialization (and its max batch size) in check
+    for start in range(0, len(batch), batch_size):
+        stop = start + batch_size
+        collection.upsert(
+            ids=batch.ids[start:stop],
+            metadatas=metadatas[start:stop],
+            documents=batch.texts[start:stop],
+            embeddings=embeddings[start:stop],
+        )
+    _collection_index.record(collection, metadatas)
 
 
 def delete_document(document_id: str) -> None:
     if _use_fallback_store():
-        remaining = [entry for entry in _fallback_store if entry["metadata"].get("document_id") != document_id]
-        _fallback_store[:] = remaining
+        if document_id in _fallback_rows_by_document():
+            with _fallback_lock:
+                _fallback_store[:] = [
+                    entry
+                    for entry in _fallback_store
+                    if entry["metadata"].get("document_id") != document_id
+                ]
+                _invalidate_fallback_documents()
         return
     collection = get_collection()
     collection.delete(where={"document_id": document_id})
+    _collection_index.discard(collection, document_id)
+
+
+class _CollectionIndex:
+    """``document_id -> collection`` map kept current by this process's writes.
+
+    The map is rebuilt from first chunks when the collection handle changes or after
+    ``ttl_seconds``, which picks up ingests run by other processes.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._source: Any = None
+        self._loaded_at = 0.0
+        self._collections: dict[str, str] = {}
+
+    def _fresh(self, collection: Any) -> bool:
+        return (
+            self._source is collection
+            and time.monotonic() - self._loaded_at < self.ttl_seconds
+        )
+
+    def record(self, collection: Any, metadatas: Iterable[dict[str, Any]]) -> None:
+        with self._lock:
+            if self._source is not collection:
+                return
+            for metadata in metadatas:
+                document_id = metadata.get("document_id")
+                if document_id is not None:
+                    self._collections[document_id] = metadata.get("collection", "other")
+
+    def discard(self, collection: Any, document_id: str) -> None:
+        with self._lock:
+            if self._source is collection:
+                self._collections.pop(document_id, None)
+
+    def document_counts(self, collection: Any) -> dict[str, int]:
+        with self._lock:
+            if not self._fresh(collection):
+                result = collection.get(where={"chunk_index": 0}, include=["metadatas"])
+                metadatas = result.get("metadatas") or []
+                if metadatas and isinstance(metadatas[0], list):
+                    metadatas = [item for group in metadatas for item in group]
+                self._collections = {
+                    metadata["document_id"]: metadata.get("collection", "other")
+                    for metadata in metadatas
+                    if metadata and metadata.get("document_id") is not None
+                }
+                self._source = collection
+                self._loaded_at = time.monotonic()
+            counts: dict[str, int] = {}
+            for name in self._collections.values():
+                counts[name] = counts.get(name, 0) + 1
+            return counts
+
+
+_collection_index = _CollectionIndex()
+
+
+def collection_document_counts(collection: Any = None) -> dict[str, int]:
+    """Return the number of distinct documents stored per collection."""
+    if collection is None:
+        collection = get_collection()
+    return _collection_index.document_counts(collection)
 
 
 def query(
@@ -157,24 +460,28 @@ def query(
     provider = embedding_provider
     if provider is None:
         raise RuntimeError("embedding_provider is required for querying")
-    vector = provider.embed([query_text])[0]
+    vector = l2_normalize(provider.embed([query_text])[0])
     where = None
     if collections:
         where = {"collection": {"$in": collections}}
     if _use_fallback_store():
+        vector_norm = math.hypot(*vector)
+        # Score every candidate first; results are only materialized for the top_k winners
+        if where:
+            matches = _compile_where(where)
+            candidates = [entry for entry in _fallback_store if matches(entry["metadata"])]
+        else:
+            candidates = _fallback_store
+        scores = _cosine_scores(vector, vector_norm, candidates)
+        rows = [row for row, score in enumerate(scores) if score >= min_score]
+        # Partial selection over row indices: O(N log k) with no per-candidate tuples
         hits: list[SearchResult] = []
-        for entry in _fallback_store:
-            if where:
-                collection_filter = where.get("collection", {}).get("$in")
-                if collection_filter and entry["metadata"].get("collection") not in collection_filter:
-                    continue
-            stored_vector = entry.get("embedding", [])
-            score = _cosine_similarity(vector, stored_vector)
-            if score < min_score:
-                continue
+        for row in heapq.nlargest(top_k, rows, key=scores.__getitem__):
+            entry, score = candidates[row], scores[row]
             metadata = dict(entry["metadata"])
-            if isinstance(metadata.get("tags"), str):
-                metadata["tags"] = [t.strip() for t in metadata["tags"].split(",") if t.strip()]
+            tags = metadata.get("tags")
+            if isinstance(tags, str):
+                metadata["tags"] = _split_tags(tags)
             hits.append(
                 SearchResult(
                     id=entry["id"],
@@ -183,8 +490,7 @@ def query(
                     metadata=metadata,
                 )
             )
-        hits.sort(key=lambda r: r.score, reverse=True)
-        return hits[:top_k]
+        return hits
 
     collection = get_collection()
     results = collection.query(
@@ -197,25 +503,22 @@ def query(
 
 
 def _build_search_results(results: dict, min_score: float) -> list[SearchResult]:
+    # A single-embedding query always carries these keys with exactly one result row
     hits: list[SearchResult] = []
-    ids = results.get("ids", [[]])[0]
-    documents = results.get("documents", [[]])[0]
-    metadatas = results.get("metadatas", [[]])[0]
-    distances = results.get("distances", [[]])[0]
+    append = hits.append
     for chunk_id, chunk_text, metadata, distance in zip(
-        ids, documents, metadatas, distances, strict=False
+        results["ids"][0],
+        results["documents"][0],
+        results["metadatas"][0],
+        results["distances"][0],
+        strict=False,
     ):
-        score = 1 - float(distance)
+        score = 1.0 - float(distance)
         if score < min_score:
-            continue
-        if isinstance(metadata.get("tags"), str):
-            metadata["tags"] = [t.strip() for t in metadata["tags"].split(",") if t.strip()]
-        hits.append(
-            SearchResult(
-                id=chunk_id,
-                text=chunk_text,
-                score=score,
-                metadata=metadata,
-            )
-        )
+            # Chroma returns neighbours nearest-first, so every later row scores lower too
+            break
+        tags = metadata.get("tags")
+        if isinstance(tags, str):
+            metadata["tags"] = _split_tags(tags)
+        append(SearchResult(id=chunk_id, text=chunk_text, score=score, metadata=metadata))
     return hits
@@ -1,20 +1,57 @@
 from __future__ import annotations
 
+import gc
+import hashlib
+import os
+import shutil
 import sys
 import uuid
+from itertools import islice
 from pathlib import Path
 
 import pytest
 
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
+SAMPLE_DOCS = ROOT / "examples" / "sample_docs"
+TIKTOKEN_FIXTURES = Path(__file__).parent / "fixtures" / "tiktoken"
+
+# A vendored encoding (`make tiktoken-fixtures`) lets the chunking tests run offline
+if any(TIKTOKEN_FIXTURES.glob("*")):
+    os.environ.setdefault("TIKTOKEN_CACHE_DIR", str(TIKTOKEN_FIXTURES))
+
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
+# Import the package once here so every test module's collection finds it in sys.modules.
+# embeddings and ingest import openai at module level, so the fixtures that need them
+# import them on first use instead.
+from wargame_mcp import config  # noqa: E402
+from wargame_mcp.chunking import _encoding_for_model  # noqa: E402
+from wargame_mcp.documents import DocumentMetadata  # noqa: E402
+from wargame_mcp.mem0_client import set_mem0_client  # noqa: E402
+from wargame_mcp.vectorstore import _use_fallback_store  # noqa: E402
+
+
+_DEFAULT_GC_THRESHOLD = gc.get_threshold()
+
+
+def pytest_configure(config):
+    # Collection and the many short tests allocate lots of small objects that live until the
+    # session ends; a high gen-0 threshold skips most cyclic GC passes they would trigger
+    gc.set_threshold(50_000, 10, 10)
+
+
+def pytest_unconfigure(config):
+    gc.set_threshold(*_DEFAULT_GC_THRESHOLD)
+
 
 class FakeMem0Client:
     def __init__(self) -> None:
         self.memories: dict[str, dict[str, str]] = {}
+        # Lowercased memory text per id, partitioned by user so searches and listings only
+        # visit that user's memories; dicts keep insertion order and O(1) deletes
+        self._lowered_by_user: dict[str, dict[str, str]] = {}
 
     def memory_add(self, *, user_id: str, memory: str, scope: str, tags, source):
         memory_id = uuid.uuid4().hex
@@ -28,27 +65,38 @@ class FakeMem0Client:
             "score": 1.0,
         }
         self.memories[memory_id] = entry
+        self._lowered_by_user.setdefault(user_id, {})[memory_id] = memory.lower()
         return {"memory_id": memory_id, "status": "created"}
 
     def memory_search(self, *, query: str, user_id: str, limit: int, scopes):
         lowered = query.lower()
+        memories = self.memories
+        # Stop scanning once ``limit`` matches are found
         matches = [
-            entry
-            for entry in self.memories.values()
-            if user_id == entry["user_id"] and lowered in entry["memory"].lower()
+            memories[memory_id]
+            for memory_id in islice(
+                (
+                    memory_id
+                    for memory_id, text in self._lowered_by_user.get(user_id, {}).items()
+                    if lowered in text
+                ),
+                limit,
+            )
         ]
         for entry in matches:
             entry.setdefault("score", 0.95)
-        return matches[:limit]
+        return matches
 
     def memory_delete(self, *, memory_id: str):
-        if memory_id in self.memories:
-            del self.memories[memory_id]
-            return {"status": "deleted"}
-        return {"status": "not_found"}
+        entry = self.memories.pop(memory_id, None)
+        if entry is None:
+            return {"status": "not_found"}
+        del self._lowered_by_user[entry["user_id"]][memory_id]
+        return {"status": "deleted"}
 
     def memory_list(self, *, user_id: str, limit: int, scope: str | None, tags):
-        entries = [entry for entry in self.memories.values() if entry["user_id"] == user_id]
+        memories = self.memories
+        entries = [memories[memory_id] for memory_id in self._lowered_by_user.get(user_id, ())]
         if scope:
             entries = [entry for entry in entries if entry["scope"] == scope]
         return entries[:limit]
@@ -56,9 +104,127 @@ class FakeMem0Client:
 
 @pytest.fixture(autouse=True)
 def fake_mem0_client():
-    from wargame_mcp.mem0_client import set_mem0_client
-
     client = FakeMem0Client()
     set_mem0_client(client)  # type: ignore[arg-type]
     yield client
     set_mem0_client(None)
+
+
+@pytest.fixture(scope="module")
+def ro_metadata():
+    """Document metadata shared by a module's read-only tests; never mutate it."""
+    return DocumentMetadata(
+        document_id="doc-1",
+        source_path=Path("/test.md"),
+        collection="test",
+        title="Test Title",
+        year=2024,
+    )
+
+
+@pytest.fixture(scope="session")
+def fake_vectors() -> dict[tuple[int, str], list[float]]:
+    """Fake embedding vectors memoized by ``(dimensions, text)`` for the whole session."""
+    return {}
+
+
+@pytest.fixture(scope="module")
+def fake_embedder(fake_vectors):
+    """One deterministic fake embedding provider shared by a test module.
+
+    Its ``embed`` only hashes texts not seen earlier in the session. Tests of the hashing itself
+    should build their own ``FakeEmbeddingProvider``.
+    """
+    from wargame_mcp.embeddings import FakeEmbeddingProvider
+
+    provider = FakeEmbeddingProvider()
+    compute = provider.embed
+    dimensions = provider.dimensions
+
+    def embed(texts):
+        texts = list(texts)
+        missing = [text for text in dict.fromkeys(texts) if (dimensions, text) not in fake_vectors]
+        if missing:
+            fake_vectors.update(zip([(dimensions, text) for text in missing], compute(missing)))
+        # Hand out copies so a caller mutating its vectors cannot corrupt the memo
+        return [list(fake_vectors[dimensions, text]) for text in texts]
+
+    provider.embed = embed  # type: ignore[method-assign]
+    return provider
+
+
+@pytest.fixture(scope="session")
+def tiktoken_encoding():
+    """Load the chunking encoding once per session, skipping when it cannot be fetched.
+
+    ``_encoding_for_model`` memoizes the result, so every later chunking call reuses it and
+    tiktoken's own on-disk cache serves subsequent runs.
+    """
+    try:
+        return _encoding_for_model(config.SETTINGS.embedding_model)
+    except OSError as exc:  # requests' connection and HTTP errors subclass OSError
+        pytest.skip(f"tiktoken encoding unavailable: {exc}")
+
+
+def _corpus_digest() -> str:
+    """Hash everything an ingested corpus depends on: the sample docs, the code and the model."""
+    digest = hashlib.sha256(config.SETTINGS.embedding_model.encode())
+    for root in (SAMPLE_DOCS, SRC / "wargame_mcp"):
+        for path in sorted(root.rglob("*")):
+            if path.is_file() and "__pycache__" not in path.parts:
+                digest.update(path.relative_to(ROOT).as_posix().encode())
+                digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _store_snapshot(source: Path, snapshot: Path) -> None:
+    # Copy beside the target and rename, so concurrent xdist workers never see a partial copy
+    staging = snapshot.with_name(f"{snapshot.name}.{uuid.uuid4().hex}.tmp")
+    shutil.copytree(source, staging)
+    try:
+        staging.rename(snapshot)
+    except OSError:  # another worker stored the same snapshot first
+        shutil.rmtree(staging, ignore_errors=True)
+        return
+    for stale in snapshot.parent.iterdir():
+        if stale.name != snapshot.name and not stale.name.endswith(".tmp"):
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def ingested_corpus(request, tmp_path_factory):
+    """Ingest the sample documents once per session; returns ``(chroma_path, collection)``.
+
+    With Chroma installed the persisted store is snapshotted in the pytest cache and copied
+    back on later runs until the sample docs or the package sources change.
+    """
+    path = tmp_path_factory.mktemp("chroma")
+    collection = "shared_corpus"
+    snapshot = None
+    # The in-memory fallback store has nothing on disk to snapshot
+    if request.config.pluginmanager.has_plugin("cacheprovider") and not _use_fallback_store():
+        snapshot = request.config.cache.mkdir("wargame_chroma") / _corpus_digest()
+        if snapshot.is_dir():
+            shutil.copytree(snapshot, path, dirs_exist_ok=True)
+            return path, collection
+
+    from wargame_mcp.ingest import ingest_directory
+
+    request.getfixturevalue("tiktoken_encoding")
+    # Session fixtures cannot take the function-scoped monkeypatch, so open a private one
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(config.SETTINGS, "chroma_path", path)
+        patch.setattr(config.SETTINGS, "chroma_collection", collection)
+        ingest_directory(SAMPLE_DOCS, fake_embeddings=True)
+    if snapshot is not None:
+        _store_snapshot(path, snapshot)
+    return path, collection
+
+
+@pytest.fixture
+def shared_corpus(ingested_corpus, monkeypatch):
+    """Point the settings at the session's ingested corpus for one test."""
+    path, collection = ingested_corpus
+    monkeypatch.setattr(config.SETTINGS, "chroma_path", path)
+    monkeypatch.setattr(config.SETTINGS, "chroma_collection", collection)
+    return ingested_corpus
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from types import SimpleNamespace
+from typing import NamedTuple
 
 import pytest
 
@@ -12,7 +13,6 @@ from wargame_mcp.agent import (
     ParsedToolCall,
     build_agent_payload,
     build_tool_resources,
-    create_openai_client,
     extract_response_text,
     parse_tool_call,
 )
@@ -21,6 +21,17 @@ from wargame_mcp.embeddings import OpenAIEmbeddingProvider
 from wargame_mcp.mcp_tools import _flatten
 
 
+class _Item(NamedTuple):
+    content: list
+
+
+class _Resp(NamedTuple):
+    """Minimal Responses SDK stand-in; extract_response_text only reads these attributes."""
+
+    output_text: str
+    output: tuple[_Item, ...] = ()
+
+
 # Agent tests
 def test_mcp_server_with_defaults():
     """Test MCPServer with default values."""
@@ -68,94 +79,71 @@ def test_parse_tool_call_with_parsed_input():
     assert result is call
 
 
-def test_parse_tool_call_with_dict_arguments():
-    """Test parse_tool_call with dict arguments."""
-    raw = {
-        "id": "123",
-        "tool_name": "search",
-        "arguments": {"query": "test"},
-    }
-    result = parse_tool_call(raw)
-    assert result.arguments == {"query": "test"}
-
-
-def test_parse_tool_call_with_json_string():
-    """Test parse_tool_call with JSON string arguments."""
-    raw = {
-        "tool_name": "test",
-        "arguments": '{"key": "value"}',
-    }
-    result = parse_tool_call(raw)
-    assert result.arguments == {"key": "value"}
-
-
-def test_parse_tool_call_with_invalid_json():
-    """Test parse_tool_call with invalid JSON string."""
-    raw = {
-        "tool_name": "test",
-        "arguments": "not json",
-    }
-    result = parse_tool_call(raw)
-    assert result.arguments == {"raw": "not json"}
-
-
-def test_parse_tool_call_with_non_dict_args():
-    """Test parse_tool_call with non-dict arguments."""
-    raw = {
-        "tool_name": "test",
-        "arguments": ["list"],
-    }
-    result = parse_tool_call(raw)
-    assert result.arguments == {}
-
-
-def test_parse_tool_call_missing_name_raises():
-    """Test parse_tool_call raises when tool_name is missing."""
-    raw = {"id": "123"}
-    with pytest.raises(ValueError, match="Unable to determine tool name"):
-        parse_tool_call(raw)
+@pytest.mark.parametrize(
+    ("raw", "field", "expected"),
+    [
+        ({"tool_name": "search", "arguments": {"query": "test"}}, "arguments", {"query": "test"}),
+        ({"tool_name": "test", "arguments": '{"key": "value"}'}, "arguments", {"key": "value"}),
+        ({"tool_name": "test", "arguments": "not json"}, "arguments", {"raw": "not json"}),
+        ({"tool_name": "test", "arguments": ["list"]}, "arguments", {}),
+        ({"tool_name": "test"}, "id", "tool-call"),
+        ({"tool_name": "test"}, "server_name", "wargame-rag-mcp"),
+        ({"tool_name": "test", "server_name": "direct"}, "server_name", "direct"),
+        ({"tool_name": "test", "serverName": "camel"}, "server_name", "camel"),
+        (
+            SimpleNamespace(id="123", function=SimpleNamespace(name="tool_name", arguments="{}")),
+            "tool_name",
+            "tool_name",
+        ),
+        (
+            SimpleNamespace(id="123", function=SimpleNamespace(name="t", arguments='{"k": "v"}')),
+            "arguments",
+            {"k": "v"},
+        ),
+    ],
+    ids=[
+        "dict-arguments",
+        "json-arguments",
+        "invalid-json",
+        "non-dict-arguments",
+        "default-id",
+        "default-server",
+        "server-name",
+        "camel-server-name",
+        "function-name",
+        "function-arguments",
+    ],
+)
+def test_parse_tool_call_fields(raw, field, expected):
+    """Test parse_tool_call normalizes each payload shape to the expected field value."""
+    assert getattr(parse_tool_call(raw), field) == expected
 
 
-def test_parse_tool_call_uses_defaults():
-    """Test parse_tool_call uses default values."""
-    raw = {"tool_name": "test"}
-    result = parse_tool_call(raw)
-    assert result.id == "tool-call"
-    assert result.server_name == "wargame-rag-mcp"
+@pytest.mark.parametrize("raw", [{"id": "123"}, {"arguments": {}}, SimpleNamespace(id="1")])
+def test_parse_tool_call_missing_name_raises(raw):
+    """Test parse_tool_call raises when no tool name can be found."""
+    with pytest.raises(ValueError, match="Unable to determine tool name"):
+        parse_tool_call(raw)
 
 
 def test_extract_response_text_with_output_text_attr():
     """Test extract_response_text with output_text."""
-    response = SimpleNamespace(output_text="  Response  ")
+    response = _Resp(output_text="  Response  ")
     result = extract_response_text(response)
     assert result == "Response"
 
 
 def test_extract_response_text_with_dict_in_output():
     """Test extract_response_text with dict content."""
-    response = SimpleNamespace(
-        output_text="",
-        output=[
-            SimpleNamespace(
-                content=[{"text": "Test response"}]
-            )
-        ],
-    )
+    response = _Resp(output_text="", output=(_Item(content=[{"text": "Test response"}]),))
     result = extract_response_text(response)
     assert result == "Test response"
 
 
 def test_extract_response_text_with_type_output_text():
     """Test extract_response_text with type output_text."""
-    response = SimpleNamespace(
-        output_text="",
-        output=[
-            SimpleNamespace(
-                content=[
-                    {"type": "output_text", "output": "Typed"}
-                ]
-            )
-        ],
+    response = _Resp(
+        output_text="", output=(_Item(content=[{"type": "output_text", "output": "Typed"}]),)
     )
     result = extract_response_text(response)
     assert result == "Typed"
@@ -163,7 +151,7 @@ def test_extract_response_text_with_type_output_text():
 
 def test_extract_response_text_empty():
     """Test extract_response_text with empty response returns empty string."""
-    response = SimpleNamespace(output_text="", output=[])
+    response = _Resp(output_text="")
     result = extract_response_text(response)
     assert result == ""
 
@@ -208,22 +196,15 @@ def test_openai_provider_initialization():
     assert provider.model == "text-embedding-3-small"
 
 
-def test_openai_provider_requires_api_key():
+def test_openai_provider_requires_api_key(monkeypatch):
     """Test OpenAIEmbeddingProvider requires API key or env var."""
     from wargame_mcp import config
 
-    # Save original
-    original = config.SETTINGS.openai_api_key
-
-    # Test without API key
-    config.SETTINGS.openai_api_key = None
+    monkeypatch.setattr(config.SETTINGS, "openai_api_key", None)
 
     with pytest.raises(RuntimeError, match="OPENAI_API_KEY"):
         OpenAIEmbeddingProvider()
 
-    # Restore
-    config.SETTINGS.openai_api_key = original
-
 
 # MCP tools additional coverage
 def test_flatten_deeply_nested():
@@ -252,3 +233,32 @@ def test_parsed_tool_call_attributes():
     assert call.server_name == "test-server"
     assert call.tool_name == "test-tool"
     assert call.arguments == {"arg": "value"}
+
+
+def test_local_tool_executor_returns_native_payload():
+    """Test LocalToolExecutor returns dicts rather than pre-encoded JSON."""
+    from wargame_mcp.agent import LocalToolExecutor
+
+    executor = LocalToolExecutor(fake_embeddings=True)
+    call = ParsedToolCall(
+        id="1",
+        server_name="wargame-rag-mcp",
+        tool_name="search_wargame_docs",
+        arguments={"query": "x", "top_k": "many"},
+    )
+
+    result = executor(call)
+
+    assert isinstance(result, dict)
+    assert result["error"].startswith("Invalid parameter type")
+
+
+def test_local_tool_executor_rejects_unknown_tool():
+    """Test LocalToolExecutor raises for tools missing from its dispatch table."""
+    from wargame_mcp.agent import LocalToolExecutor
+
+    executor = LocalToolExecutor()
+    call = ParsedToolCall(id="1", server_name="wargame-mem0-mcp", tool_name="nope", arguments={})
+
+    with pytest.raises(ValueError, match="Unsupported memory tool"):
+        executor(call)
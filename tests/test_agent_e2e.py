@@ -1,14 +1,11 @@
 from __future__ import annotations
 
 import json
-import uuid
-from pathlib import Path
 from types import SimpleNamespace
 
-from wargame_mcp import config
-from wargame_mcp.agent import AgentConfig, LocalToolExecutor, WargameAssistantAgent
-from wargame_mcp.ingest import ingest_directory
-from wargame_mcp.memory_tools import memory_add_entry
+import pytest
+
+from wargame_mcp.agent import AgentConfig, WargameAssistantAgent
 
 
 class FakeToolCall:
@@ -41,8 +38,10 @@ class FakeResponse:
 
 
 class FakeResponses:
-    def __init__(self) -> None:
+    def __init__(self, parsed_outputs: dict[str, dict[str, object]] | None = None) -> None:
         self.invocations: list[dict[str, object]] = []
+        # Payloads by tool call id, filled by the executor so submitted JSON need not be re-parsed
+        self.parsed_outputs = parsed_outputs if parsed_outputs is not None else {}
         self.tool_calls = [
             FakeToolCall(
                 call_id="memory-call",
@@ -65,10 +64,12 @@ class FakeResponses:
                 response_id="resp-1", status="requires_action", tool_calls=self.tool_calls
             )
 
-        outputs = {
-            item["tool_call_id"]: json.loads(item["output"])
-            for item in kwargs.get("tool_outputs", [])
-        }
+        outputs = {}
+        for item in kwargs.get("tool_outputs", []):
+            parsed = self.parsed_outputs[item["tool_call_id"]]
+            # The submitted string must round-trip to the payload the executor recorded
+            assert json.loads(item["output"]) == parsed
+            outputs[item["tool_call_id"]] = parsed
         memory_summary = ""
         doc_summary = ""
         for call in self.tool_calls:
@@ -86,25 +87,45 @@ class FakeResponses:
 
 
 class FakeOpenAIClient:
-    def __init__(self) -> None:
-        self.responses = FakeResponses()
+    def __init__(self, parsed_outputs: dict[str, dict[str, object]] | None = None) -> None:
+        self.responses = FakeResponses(parsed_outputs)
 
 
-def _configure_chroma(tmp_path: Path) -> None:
-    config.SETTINGS.chroma_path = tmp_path / "chroma"
-    config.SETTINGS.chroma_collection = f"agent_{uuid.uuid4().hex}"
+class StubToolExecutor:
+    """Returns canned tool payloads so the agent loop runs without a vector index."""
 
+    def __init__(self, payloads: dict[str, dict[str, object]] | None = None) -> None:
+        self.history: list[object] = []
+        self.payloads = payloads if payloads is not None else {}
+
+    def __call__(self, call) -> dict[str, object]:
+        self.history.append(call)
+        if call.tool_name == "memory_search":
+            payload = {"results": [{"memory": "Baltic Shield 2025 bevorzugte COA Bravo"}]}
+        else:
+            payload = {"results": [{"metadata": {"title": "Urban defense"}}]}
+        self.payloads[call.id] = payload
+        return payload
+
+
+@pytest.fixture(scope="module")
+def fake_openai_client():
+    """One fake OpenAI client shared by the module's tests."""
+    return FakeOpenAIClient()
+
+
+@pytest.fixture
+def stub_executor(fake_openai_client):
+    """A fresh executor feeding the shared client; the client's per-test state is reset after."""
+    responses = fake_openai_client.responses
+    yield StubToolExecutor(responses.parsed_outputs)
+    responses.invocations.clear()
+    responses.parsed_outputs.clear()
 
-def test_agent_flow_uses_tools(tmp_path, fake_mem0_client):
-    _configure_chroma(tmp_path)
-    ingest_directory(Path("examples/sample_docs"), fake_embeddings=True)
-    memory_add_entry(
-        user_id="demo-user", memory="Baltic Shield 2025 bevorzugte COA Bravo", scope="scenario"
-    )
 
-    fake_client = FakeOpenAIClient()
-    agent = WargameAssistantAgent(client=fake_client, config=AgentConfig(model="fake-model"))
-    executor = LocalToolExecutor(fake_embeddings=True)
+def test_agent_flow_uses_tools(fake_openai_client, stub_executor):
+    agent = WargameAssistantAgent(client=fake_openai_client, config=AgentConfig(model="fake-model"))
+    executor = stub_executor
 
     answer = agent.run_conversation(
         question="Welche Lessons Learned gelten für urbane Verteidigung?",
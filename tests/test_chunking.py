@@ -0,0 +1,108 @@
+"""Unit tests for the token chunker using a byte-level stand-in encoding."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from wargame_mcp import chunking
+from wargame_mcp.documents import DocumentMetadata
+
+
+class _ByteEncoding:
+    def encode(self, text: str) -> list[int]:
+        return list(text.encode("utf-8"))
+
+    def decode(self, tokens) -> str:
+        return bytes(list(tokens)).decode("utf-8", errors="ignore")
+
+
+@pytest.fixture
+def byte_encoding(monkeypatch):
+    encoding = _ByteEncoding()
+    monkeypatch.setattr(chunking, "_encoding_for_model", lambda _model: encoding)
+    return encoding
+
+
+def _metadata() -> DocumentMetadata:
+    return DocumentMetadata(document_id="doc", source_path=Path("doc.md"))
+
+
+def _expected_boundaries(token_count: int) -> list[tuple[int, int]]:
+    boundaries = []
+    start = 0
+    while True:
+        end = min(token_count, start + chunking.CHUNK_SIZE_TOKENS)
+        boundaries.append((start, end))
+        if end >= token_count:
+            return boundaries
+        start += chunking.CHUNK_SIZE_TOKENS - chunking.CHUNK_OVERLAP_TOKENS
+
+
+def test_chunk_text_empty(byte_encoding):
+    """Test empty text produces no chunks."""
+    result = chunking.chunk_text(_metadata(), "", "test-model")
+    assert result.chunks == []
+    assert result.token_count == 0
+
+
+@pytest.mark.parametrize("length", [1, 799, 800, 801, 1400, 1401, 2000, 5123])
+def test_chunk_text_boundaries(byte_encoding, length):
+    """Test chunk boundaries and counts follow the size/overlap windows."""
+    text = "".join(chr(ord("a") + i % 26) for i in range(length))
+    result = chunking.chunk_text(_metadata(), text, "test-model")
+
+    expected = _expected_boundaries(length)
+    assert result.token_count == length
+    assert [chunk.text for chunk in result.chunks] == [text[s:e] for s, e in expected]
+    assert all(chunk.chunk_count == len(expected) for chunk in result.chunks)
+    assert [chunk.chunk_index for chunk in result.chunks] == list(range(len(expected)))
+    assert result.chunks[-1].id == f"doc:{len(expected) - 1}"
+
+
+def test_chunk_text_decodes_each_slice_without_decode_batch(monkeypatch):
+    """Test multi-chunk documents decode slice by slice instead of spawning decode_batch pools."""
+
+    class _BatchEncoding(_ByteEncoding):
+        def decode_batch(self, batch, num_threads: int = 8) -> list[str]:
+            raise AssertionError("decode_batch starts a thread pool per call")
+
+    encoding = _BatchEncoding()
+    monkeypatch.setattr(chunking, "_encoding_for_model", lambda _model: encoding)
+
+    text = "x" * 2000
+    result = chunking.chunk_text(_metadata(), text, "test-model")
+
+    assert [chunk.text for chunk in result.chunks] == ["x" * 800, "x" * 800, "x" * 800]
+
+
+def test_encoding_for_model_falls_back_for_unknown_models(monkeypatch):
+    """Test unregistered model names resolve to the default encoding and are cached."""
+    calls: list[str] = []
+
+    class _Registry:
+        def encoding_for_model(self, model: str):
+            calls.append(model)
+            raise KeyError(model)
+
+        def get_encoding(self, name: str) -> str:
+            return name
+
+    monkeypatch.setattr(chunking, "_get_tiktoken", _Registry)
+    chunking._encoding_for_model.cache_clear()
+    try:
+        assert chunking._encoding_for_model("custom-model") == chunking.DEFAULT_ENCODING
+        assert chunking._encoding_for_model("custom-model") == chunking.DEFAULT_ENCODING
+        assert calls == ["custom-model"]
+    finally:
+        chunking._encoding_for_model.cache_clear()
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [("doc.md", True), ("DOC.MD", True), ("a.b.md", True), ("doc.txt", False), (".md", False)],
+)
+def test_supported_suffix(name, expected):
+    """Test supported_suffix matches Path.suffix semantics case-insensitively."""
+    assert chunking.supported_suffix(Path(name)) is expected
@@ -2,11 +2,10 @@
 
 from __future__ import annotations
 
-from pathlib import Path
+import pytest
 
 from wargame_mcp.config import SETTINGS
 from wargame_mcp.documents import slugify
-from wargame_mcp.embeddings import FakeEmbeddingProvider
 from wargame_mcp.ingest import ingest_directory
 from wargame_mcp.mcp_tools import ToolResult
 from wargame_mcp.metadata_loader import metadata_for_document
@@ -35,6 +34,47 @@ def test_metadata_for_document_simple(tmp_path):
     assert metadata.source_path == doc
 
 
+def test_metadata_for_document_reparses_only_changed_sidecars(tmp_path, monkeypatch):
+    """Test sidecar YAML is parsed once while unchanged and again after it changes."""
+    import os
+
+    from wargame_mcp import metadata_loader
+
+    if metadata_loader.yaml is None:
+        pytest.skip("PyYAML not installed")
+    doc = tmp_path / "doc.md"
+    doc.write_text("# Doc")
+    sidecar = tmp_path / "doc.md.meta.yml"
+    sidecar.write_text("title: First\ntags: [a]\n")
+    calls: list[object] = []
+    real_load_yaml = metadata_loader._load_yaml
+    monkeypatch.setattr(
+        metadata_loader, "_load_yaml", lambda path: calls.append(path) or real_load_yaml(path)
+    )
+
+    first = metadata_for_document(doc)
+    first.tags.append("mutated")
+    second = metadata_for_document(doc)
+    assert (second.title, second.tags, len(calls)) == ("First", ["a"], 1)
+
+    sidecar.write_text("title: Second\ntags: [b]\n")
+    os.utime(sidecar, ns=(0, 1))
+    third = metadata_for_document(doc)
+    assert (third.title, third.tags, len(calls)) == ("Second", ["b"], 2)
+
+
+def test_read_text_tracks_file_changes(tmp_path):
+    """Test cached reads are invalidated when the file's size or mtime changes."""
+    from wargame_mcp.chunking import read_text
+
+    doc = tmp_path / "doc.md"
+    doc.write_text("one")
+    assert read_text(doc) == "one"
+    assert read_text(doc) == "one"
+    doc.write_text("three")
+    assert read_text(doc) == "three"
+
+
 # Slugify tests
 def test_slugify_converts_to_lowercase():
     """Test slugify converts to lowercase."""
@@ -42,16 +82,78 @@ def test_slugify_converts_to_lowercase():
     assert result.islower()
 
 
-# Embeddings tests
-def test_fake_embedding_unicode_support():
-    """Test FakeEmbeddingProvider handles Unicode."""
-    provider = FakeEmbeddingProvider()
-    result = provider.embed(["Test 你好"])
-    assert len(result) == 1
-
-
 # Ingest tests
 def test_ingest_empty_directory(tmp_path):
     """Test ingest_directory with empty directory."""
     summary = ingest_directory(tmp_path, fake_embeddings=True)
     assert summary.document_count == 0
+
+
+def test_load_yaml_uses_safe_loader(tmp_path):
+    """Test sidecars parse with the (C-accelerated) safe loader and reject Python tags."""
+    from wargame_mcp import metadata_loader
+
+    if metadata_loader.yaml is None:
+        pytest.skip("PyYAML not installed")
+    good = tmp_path / "good.yml"
+    good.write_text("title: Doc\ntags:\n  - a\n  - b\n")
+    unsafe = tmp_path / "unsafe.yml"
+    unsafe.write_text("title: !!python/object/apply:os.getcwd []\n")
+
+    assert metadata_loader._load_yaml(good) == {"title": "Doc", "tags": ["a", "b"]}
+    assert metadata_loader._load_yaml(unsafe) is None
+
+
+def test_metadata_for_document_normalizes_unknown_collection(tmp_path):
+    """Test sidecar collections outside COLLECTIONS fall back to "other"."""
+    from wargame_mcp import metadata_loader
+
+    if metadata_loader.yaml is None:
+        pytest.skip("PyYAML not installed")
+    doc = tmp_path / "report.md"
+    doc.write_text("# Report")
+    (tmp_path / "report.md.meta.yml").write_text("title: Report\ncollection: rumours\nyear: 1999\n")
+
+    metadata = metadata_for_document(doc)
+
+    assert metadata.collection == "other"
+    assert metadata.year == 1999
+    assert isinstance(metadata_loader.COLLECTIONS, frozenset)
+
+
+def test_load_yaml_reads_missing_and_utf8_sidecars(tmp_path):
+    """Test missing sidecars yield None and UTF-8 bytes decode correctly."""
+    from wargame_mcp import metadata_loader
+
+    if metadata_loader.yaml is None:
+        pytest.skip("PyYAML not installed")
+    sidecar = tmp_path / "doc.md.meta.yml"
+    sidecar.write_bytes("title: Übung Nord\n".encode())
+
+    assert metadata_loader._load_yaml(tmp_path / "missing.yml") is None
+    assert metadata_loader._load_yaml(sidecar) == {"title": "Übung Nord"}
+
+
+def test_metadata_for_document_skips_yaml_without_sidecar(tmp_path, monkeypatch):
+    """Test documents without a sidecar never attempt a YAML load."""
+    from wargame_mcp import metadata_loader
+
+    doc = tmp_path / "plain_doc.md"
+    doc.write_text("# Doc")
+    calls: list[object] = []
+    monkeypatch.setattr(metadata_loader, "_load_yaml", calls.append)
+
+    assert metadata_for_document(doc).title == "plain doc"
+    assert calls == []
+
+
+def test_load_yaml_treats_undecodable_bytes_as_missing(tmp_path):
+    """Test sidecars that are not valid UTF-8 are ignored rather than raising."""
+    from wargame_mcp import metadata_loader
+
+    if metadata_loader.yaml is None:
+        pytest.skip("PyYAML not installed")
+    sidecar = tmp_path / "doc.md.meta.yml"
+    sidecar.write_bytes(b"title: \xff\xfe\xfa\n")
+
+    assert metadata_loader._load_yaml(sidecar) is None
@@ -0,0 +1,139 @@
+"""Tests for the content-addressed embedding cache."""
+
+from __future__ import annotations
+
+import pytest
+
+from wargame_mcp.embeddings_cache import EmbeddingCache, embed_with_cache
+
+
+class _CountingProvider:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def embed(self, texts):
+        texts = list(texts)
+        self.calls.append(texts)
+        return [[float(len(text)), 0.5] for text in texts]
+
+
+def test_embed_with_cache_only_embeds_misses(tmp_path):
+    """Test cached texts are served from SQLite and only misses hit the provider."""
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", "model-a")
+    provider = _CountingProvider()
+
+    first = embed_with_cache(provider.embed, ["alpha", "beta"], cache)
+    second = embed_with_cache(provider.embed, ["beta", "gamma", "alpha"], cache)
+    cache.close()
+
+    assert provider.calls == [["alpha", "beta"], ["gamma"]]
+    assert first == [[5.0, 0.5], [4.0, 0.5]]
+    assert second == [[4.0, 0.5], [5.0, 0.5], [5.0, 0.5]]
+
+
+def test_embedding_cache_is_partitioned_by_model(tmp_path):
+    """Test vectors stored for one model are not returned for another."""
+    path = tmp_path / "cache.sqlite3"
+    cache_a = EmbeddingCache(path, "model-a")
+    cache_a.put_many(["text"], [[1.0, 2.0]])
+    cache_a.close()
+
+    cache_a = EmbeddingCache(path, "model-a")
+    cache_b = EmbeddingCache(path, "model-b")
+    assert cache_a.get_many(["text"]) == [[1.0, 2.0]]
+    assert cache_b.get_many(["text"]) == [None]
+    cache_a.close()
+    cache_b.close()
+
+
+def test_embed_with_cache_without_cache_delegates():
+    """Test a missing cache falls straight through to the provider."""
+    provider = _CountingProvider()
+    assert embed_with_cache(provider.embed, ["x"], None) == [[1.0, 0.5]]
+    assert provider.calls == [["x"]]
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+        self.expiries: dict[str, int | None] = {}
+
+    def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction: bool = True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis: _FakeRedis) -> None:
+        self.redis = redis
+        self.ops: list[tuple[str, bytes, int | None]] = []
+
+    def set(self, key, value, ex=None):
+        self.ops.append((key, value, ex))
+
+    def execute(self):
+        for key, value, ex in self.ops:
+            self.redis.store[key] = value
+            self.redis.expiries[key] = ex
+
+
+def test_redis_embedding_cache_round_trip():
+    """Test Redis cache stores float32 blobs under model-scoped keys with a TTL."""
+    from wargame_mcp.embeddings_cache import RedisEmbeddingCache, text_digest
+
+    redis = _FakeRedis()
+    cache = RedisEmbeddingCache(redis, "model-a", ttl_seconds=60)
+    provider = _CountingProvider()
+
+    embed_with_cache(provider.embed, ["alpha"], cache)
+    assert embed_with_cache(provider.embed, ["alpha"], cache) == [[5.0, 0.5]]
+    assert provider.calls == [["alpha"]]
+    key = f"emb:model-a:{text_digest('alpha')}"
+    assert len(redis.store[key]) == 8
+    assert redis.expiries[key] == 60
+
+
+def test_redis_embedding_cache_errors_are_misses():
+    """Test Redis failures degrade to cache misses instead of failing embeds."""
+    from wargame_mcp.embeddings_cache import RedisEmbeddingCache
+
+    class _BrokenRedis:
+        def mget(self, keys):
+            raise ConnectionError("down")
+
+        def pipeline(self, transaction: bool = True):
+            raise ConnectionError("down")
+
+    provider = _CountingProvider()
+    cache = RedisEmbeddingCache(_BrokenRedis(), "model-a")
+    assert embed_with_cache(provider.embed, ["x"], cache) == [[1.0, 0.5]]
+
+
+def test_redis_embedding_cache_without_redis_names_the_extra(monkeypatch):
+    """Test a missing redis package raises an error pointing at the cache extra."""
+    from wargame_mcp import embeddings_cache
+
+    monkeypatch.setattr(embeddings_cache.importlib.util, "find_spec", lambda _name: None)
+    with pytest.raises(RuntimeError, match=r"wargame-mcp\[cache\]"):
+        embeddings_cache.RedisEmbeddingCache.from_url("redis://localhost:6379/0", "model-a")
+
+
+def test_int8_cache_round_trip_is_compact_and_namespaced(tmp_path):
+    """Test int8 caching stores ~1 byte per component and is kept apart from fp32 rows."""
+    from wargame_mcp.embeddings_cache import pack_int8_vector, pack_vector
+
+    vector = [0.5, -1.0, 0.25, 0.0] * 64
+    assert len(pack_int8_vector(vector)) * 3 < len(pack_vector(vector))
+
+    path = tmp_path / "cache.sqlite3"
+    cache = EmbeddingCache(path, "model-a", quantization="int8")
+    cache.put_many(["text"], [vector])
+    (restored,) = cache.get_many(["text"])
+    cache.close()
+    assert all(abs(a - b) <= 1.0 / 127 for a, b in zip(restored, vector, strict=True))
+
+    fp32_cache = EmbeddingCache(path, "model-a")
+    assert fp32_cache.get_many(["text"]) == [None]
+    fp32_cache.close()
@@ -0,0 +1,168 @@
+"""Unit tests for the ingestion pipeline using stand-in tokenizer and embeddings."""
+
+from __future__ import annotations
+
+import pytest
+
+from wargame_mcp import chunking, ingest
+from wargame_mcp.config import SETTINGS
+
+
+class _ByteEncoding:
+    def encode(self, text: str) -> list[int]:
+        return list(text.encode("utf-8"))
+
+    def decode(self, tokens) -> str:
+        return bytes(list(tokens)).decode("utf-8", errors="ignore")
+
+
+class _RecordingProvider:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def embed(self, texts):
+        texts = list(texts)
+        self.calls.append(texts)
+        return [[float(len(text))] for text in texts]
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    provider = _RecordingProvider()
+    stored: dict[str, list] = {}
+    monkeypatch.setattr(SETTINGS, "embedding_cache_path", None)
+    monkeypatch.setattr(chunking, "_encoding_for_model", lambda _model: _ByteEncoding())
+    monkeypatch.setattr(ingest, "build_embedding_provider", lambda fake=False: provider)
+    monkeypatch.setattr(ingest, "delete_document", lambda document_id: stored.pop(document_id, None))
+
+    def _upsert(chunks, vectors):
+        for chunk, vector in zip(chunks, vectors, strict=True):
+            stored.setdefault(chunk.metadata.document_id, []).append((chunk.text, vector))
+
+    monkeypatch.setattr(ingest, "upsert_chunks", _upsert)
+    return provider, stored
+
+
+def test_ingest_directory_batches_embeddings_across_files(tmp_path, pipeline):
+    """Test chunks from several files are embedded in a single provider call."""
+    provider, stored = pipeline
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.md").write_text(f"# {name}\n" + name * 10)
+
+    summary = ingest.ingest_directory(tmp_path, fake_embeddings=True)
+
+    assert summary.document_count == 3
+    assert summary.chunk_count == 3
+    assert len(provider.calls) == 1
+    stored_chunks = [chunk for chunks in stored.values() for chunk in chunks]
+    assert sorted(text for text, _ in stored_chunks) == sorted(provider.calls[0])
+    assert all(vector == [float(len(text))] for text, vector in stored_chunks)
+
+
+def test_ingest_directory_flushes_at_batch_size(tmp_path, pipeline, monkeypatch):
+    """Test a new embedding request starts once the batch size is reached."""
+    provider, _ = pipeline
+    monkeypatch.setattr(SETTINGS, "embed_batch_size", 2)
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.md").write_text(name)
+
+    summary = ingest.ingest_directory(tmp_path, fake_embeddings=True)
+
+    assert summary.document_count == 3
+    assert [len(call) for call in provider.calls] == [2, 1]
+
+
+def test_ingest_directory_flushes_at_token_budget(tmp_path, pipeline, monkeypatch):
+    """Test requests are cut once the running token sum would pass the token budget."""
+    provider, _ = pipeline
+    monkeypatch.setattr(SETTINGS, "embed_batch_max_tokens", 15)
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.md").write_text(name * 10)
+
+    summary = ingest.ingest_directory(tmp_path, fake_embeddings=True)
+
+    assert summary.document_count == 3
+    assert [len(call) for call in provider.calls] == [1, 1, 1]
+
+
+def test_ingest_directory_splits_oversized_document(tmp_path, pipeline, monkeypatch):
+    """Test a single document over the token budget is embedded in several requests."""
+    provider, stored = pipeline
+    monkeypatch.setattr(SETTINGS, "embed_batch_max_tokens", 1000)
+    (tmp_path / "big.md").write_text("x" * 2000)
+
+    summary = ingest.ingest_directory(tmp_path, fake_embeddings=True)
+
+    assert summary.chunk_count == 3
+    assert [len(call) for call in provider.calls] == [1, 1, 1]
+    assert [len(chunks) for chunks in stored.values()] == [3]
+
+
+def test_chunk_token_counts_account_for_overlap():
+    """Test per-chunk token counts sum the overlapping windows actually sent."""
+    from wargame_mcp.chunking import ChunkingResult
+
+    result = ChunkingResult(chunks=[object()] * 3, token_count=2000)  # type: ignore[list-item]
+
+    assert ingest._chunk_token_counts(result) == [800, 800, 800]
+    assert ingest._embedded_tokens(ChunkingResult(chunks=[], token_count=0)) == 0
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_ingest_directory_reports_failures_per_file(tmp_path, pipeline, monkeypatch, workers):
+    """Test a failing file is reported while the rest are ingested, with or without threads."""
+    monkeypatch.setattr(SETTINGS, "ingest_workers", workers)
+    real_read_text = ingest.read_text
+
+    def _read_text(path):
+        if path.name == "bad.md":
+            raise PermissionError(path)
+        return real_read_text(path)
+
+    monkeypatch.setattr(ingest, "read_text", _read_text)
+    for name in ("a", "bad", "c"):
+        (tmp_path / f"{name}.md").write_text(name)
+
+    summary = ingest.ingest_directory(tmp_path, fake_embeddings=True)
+
+    assert summary.document_count == 2
+
+
+def test_prepare_all_bounds_files_in_flight(tmp_path, pipeline, monkeypatch):
+    """Test the thread pool only pulls a bounded window of paths ahead of the consumer."""
+    monkeypatch.setattr(SETTINGS, "ingest_workers", 2)
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"{i}.md"
+        path.write_text(str(i))
+        paths.append(path)
+    pulled = 0
+
+    def _paths():
+        nonlocal pulled
+        for path in paths:
+            pulled += 1
+            yield path
+
+    results = ingest._prepare_all(_paths())
+    first_path, _ = next(results)
+
+    assert first_path == paths[0]
+    assert pulled == 4
+    assert [path for path, _ in results] == paths[1:]
+
+
+def test_open_embedding_cache_is_opt_in_and_yields_to_redis(tmp_path, monkeypatch):
+    """Test the SQLite cache is off by default and skipped when Redis is configured."""
+    provider = _RecordingProvider()
+    monkeypatch.setattr(SETTINGS, "embedding_cache_path", None)
+    monkeypatch.setattr(SETTINGS, "redis_url", None)
+    assert ingest._open_embedding_cache(provider) is None
+
+    monkeypatch.setattr(SETTINGS, "embedding_cache_path", str(tmp_path / "cache.sqlite3"))
+    cache = ingest._open_embedding_cache(provider)
+    assert isinstance(cache, ingest.EmbeddingCache)
+    cache.close()
+
+    monkeypatch.setattr(SETTINGS, "redis_url", "redis://localhost:6379/0")
+    assert ingest._open_embedding_cache(provider) is None
@@ -2,19 +2,34 @@
 
 from __future__ import annotations
 
-from pathlib import Path
+from datetime import UTC, datetime
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import pytest
+
+from wargame_mcp.agent import extract_response_text
+from wargame_mcp.chunking import read_text
+from wargame_mcp.documents import IngestionSummary
+from wargame_mcp.embeddings import FakeEmbeddingProvider, build_embedding_provider
+from wargame_mcp.ingest import _print_summary
 from wargame_mcp.mcp_tools import search_wargame_documents
-from wargame_mcp.vectorstore import SearchResult
+from wargame_mcp.vectorstore import SearchResult, query
+
+
+@pytest.fixture
+def patched_query(monkeypatch):
+    """Stub out the vector query and embedding provider used by search_wargame_documents."""
+    stub = MagicMock(return_value=[])
+    monkeypatch.setattr("wargame_mcp.mcp_tools.query", stub)
+    monkeypatch.setattr("wargame_mcp.mcp_tools.build_embedding_provider", MagicMock())
+    return stub
 
 
 # More mcp_tools coverage
-@patch("wargame_mcp.mcp_tools.query")
-@patch("wargame_mcp.mcp_tools.build_embedding_provider")
-def test_search_wargame_documents_basic(mock_provider, mock_query):
+def test_search_wargame_documents_basic(patched_query):
     """Test search_wargame_documents basic functionality."""
-    mock_query.return_value = [
+    patched_query.return_value = [
         SearchResult(id="1", text="Test", score=0.9, metadata={"collection": "test"})
     ]
 
@@ -29,12 +44,8 @@ def test_search_wargame_documents_basic(mock_provider, mock_query):
     assert result.results[0]["id"] == "1"
 
 
-@patch("wargame_mcp.mcp_tools.query")
-@patch("wargame_mcp.mcp_tools.build_embedding_provider")
-def test_search_wargame_documents_with_collections(mock_provider, mock_query):
+def test_search_wargame_documents_with_collections(patched_query):
     """Test search_wargame_documents with collection filter."""
-    mock_query.return_value = []
-
     result = search_wargame_documents(
         query_text="test",
         collections=["nato", "urban"],
@@ -42,15 +53,13 @@ def test_search_wargame_documents_with_collections(mock_provider, mock_query):
     )
 
     assert result.results == []
+    assert patched_query.call_args.kwargs["collections"] == ["nato", "urban"]
 
 
 # More vectorstore coverage
 @patch("wargame_mcp.vectorstore.get_collection")
 def test_query_integration(mock_get_collection):
     """Test query function from vectorstore."""
-    from wargame_mcp.vectorstore import query
-    from wargame_mcp.embeddings import FakeEmbeddingProvider
-
     mock_collection = MagicMock()
     mock_collection.query.return_value = {
         "ids": [["1"]],
@@ -71,9 +80,6 @@ def test_query_integration(mock_get_collection):
 
 
 # More chunking coverage
-from wargame_mcp.chunking import read_text
-
-
 def test_read_text_with_newlines(tmp_path):
     """Test read_text preserves newlines."""
     file = tmp_path / "test.md"
@@ -87,10 +93,6 @@ def test_read_text_with_newlines(tmp_path):
 
 
 # More agent coverage
-from wargame_mcp.agent import extract_response_text
-from types import SimpleNamespace
-
-
 def test_extract_response_text_nested_structure():
     """Test extract_response_text with various nested structures."""
     # Test with empty output_text but content in output
@@ -111,9 +113,6 @@ def test_extract_response_text_nested_structure():
 
 
 # More embeddings coverage
-from wargame_mcp.embeddings import build_embedding_provider
-
-
 def test_build_embedding_provider_returns_correct_type():
     """Test build_embedding_provider returns correct provider type."""
     fake_provider = build_embedding_provider(fake=True)
@@ -124,11 +123,6 @@ def test_build_embedding_provider_returns_correct_type():
 
 
 # More ingest coverage
-from wargame_mcp.ingest import _print_summary
-from wargame_mcp.documents import IngestionSummary
-from datetime import UTC, datetime
-
-
 def test_print_summary(capsys):
     """Test _print_summary outputs table."""
     summary = IngestionSummary(
@@ -143,3 +137,21 @@ def test_print_summary(capsys):
 
     captured = capsys.readouterr()
     assert "5" in captured.out or "Documents" in captured.out
+
+
+def test_read_text_normalizes_crlf(tmp_path):
+    """Test read_text converts Windows line endings to LF."""
+    file = tmp_path / "crlf.md"
+    file.write_bytes(b"Line 1\r\nLine 2\r\n")
+
+    assert read_text(file) == "Line 1\nLine 2\n"
+
+
+def test_extract_response_text_object_content():
+    """Test extract_response_text reads text from SDK-style content objects."""
+    response = SimpleNamespace(
+        output_text=None,
+        output=[SimpleNamespace(content=[SimpleNamespace(text="  Object text ")])],
+    )
+
+    assert extract_response_text(response) == "Object text"
@@ -21,3 +21,155 @@ def test_memory_flow(fake_mem0_client):
     memory_id = listing["results"][0]["memory_id"]
     delete = memory_delete_entry(memory_id=memory_id)
     assert delete["status"] == "deleted"
+
+
+def test_mem0_client_uses_pooled_keepalive_client(monkeypatch):
+    """Test Mem0Client builds one pooled httpx client with connection limits."""
+    import httpx
+
+    from wargame_mcp.mem0_client import Mem0Client
+
+    created: dict = {}
+
+    class _Client:
+        def __init__(self, **kwargs) -> None:
+            created.update(kwargs)
+            self.closed = False
+
+        def close(self) -> None:
+            self.closed = True
+
+    class _Httpx:
+        Client = _Client
+        Limits = httpx.Limits
+
+    monkeypatch.setattr(Mem0Client, "_import_httpx", staticmethod(lambda: _Httpx))
+
+    client = Mem0Client(base_url="http://mem0.local/")
+
+    assert created["base_url"] == "http://mem0.local"
+    assert created["limits"].max_keepalive_connections == 32
+    assert "http2" in created
+    client.close()
+    assert client._client.closed
+
+
+def test_mem0_client_request_encodes_and_decodes_json_bytes():
+    """Test request bodies are sent as JSON bytes and responses parsed from raw content."""
+    import json
+
+    import httpx
+
+    from wargame_mcp.mem0_client import Mem0Client
+
+    seen: dict = {}
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        seen["content_type"] = request.headers["Content-Type"]
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, content=b'{"memory_id": "m-1"}')
+
+    client = Mem0Client(base_url="http://mem0.local")
+    client._client = httpx.Client(
+        base_url="http://mem0.local", transport=httpx.MockTransport(_handler)
+    )
+
+    payload = client.memory_add(user_id="u", memory="note", scope="user", tags=["t"], source=None)
+
+    assert payload == {"memory_id": "m-1"}
+    assert seen["content_type"] == "application/json"
+    assert seen["body"] == {"user_id": "u", "memory": "note", "scope": "user", "tags": ["t"]}
+
+
+def test_in_flight_coalescer_shares_identical_concurrent_calls():
+    """Test identical concurrent reads share one call while distinct keys run separately."""
+    import asyncio
+    import threading
+
+    from wargame_mcp.mem0_server import InFlightCoalescer
+
+    calls: list[str] = []
+    release = threading.Event()
+
+    def _search(*, query: str) -> dict:
+        calls.append(query)
+        release.wait(timeout=5)
+        return {"results": [query]}
+
+    async def _main():
+        coalescer = InFlightCoalescer()
+        first = asyncio.ensure_future(coalescer.run("a", _search, query="a"))
+        second = asyncio.ensure_future(coalescer.run("a", _search, query="a"))
+        other = asyncio.ensure_future(coalescer.run("b", _search, query="b"))
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(first, second, other)
+        again = await coalescer.run("a", _search, query="a")
+        return results, again
+
+    results, again = asyncio.run(_main())
+
+    assert results == [{"results": ["a"]}, {"results": ["a"]}, {"results": ["b"]}]
+    assert again == {"results": ["a"]}
+    assert sorted(calls) == ["a", "a", "b"]
+
+
+def test_inflight_coalescer_logs_caller_and_leader_ids(monkeypatch):
+    """Test a coalesced caller logs its own correlation id next to the leader's."""
+    import asyncio
+    import threading
+
+    from wargame_mcp import mem0_server
+    from wargame_mcp.instrumentation import get_correlation_id
+
+    events: list[dict] = []
+    monkeypatch.setattr(mem0_server.logger, "info", lambda event, **fields: events.append(fields))
+    release = threading.Event()
+
+    def _search(*, query: str, correlation_id: str) -> dict:
+        release.wait(timeout=5)
+        # The coalescer binds the leader's id in the worker thread
+        return {"results": [query], "correlation_id": get_correlation_id()}
+
+    async def _main():
+        coalescer = mem0_server.InFlightCoalescer()
+        leader = asyncio.ensure_future(coalescer.run("a", _search, query="a", correlation_id="lead"))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(
+            coalescer.run("a", _search, query="a", correlation_id="follow")
+        )
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(leader, follower)
+
+    leader_result, follower_result = asyncio.run(_main())
+
+    assert leader_result == follower_result == {"results": ["a"], "correlation_id": "lead"}
+    assert events == [
+        {"operation": "_search", "correlation_id": "follow", "leader_correlation_id": "lead"}
+    ]
+
+
+def test_get_mem0_client_builds_once_under_concurrency(monkeypatch):
+    """Test concurrent first calls share a single lazily built client."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from wargame_mcp import mem0_client
+
+    built: list[object] = []
+
+    def _build():
+        built.append(object())
+        return built[-1]
+
+    monkeypatch.setattr(mem0_client, "build_mem0_client", _build)
+    previous = mem0_client._mem0_client
+    mem0_client.set_mem0_client(None)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            clients = list(pool.map(lambda _: mem0_client.get_mem0_client(), range(32)))
+    finally:
+        mem0_client.set_mem0_client(previous)
+
+    assert len(built) == 1
+    assert all(client is built[0] for client in clients)
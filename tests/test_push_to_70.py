@@ -2,13 +2,49 @@
 
 from __future__ import annotations
 
+import dataclasses
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
+from wargame_mcp import mcp_tools, vectorstore
+from wargame_mcp.agent import (
+    SYSTEM_PROMPT,
+    AgentConfig,
+    MCPServer,
+    build_agent_payload,
+    build_tool_resources,
+)
 from wargame_mcp.chunking import iter_documents, read_text
+from wargame_mcp.documents import DocumentChunk, DocumentMetadata
+from wargame_mcp.instrumentation import latencies
 from wargame_mcp.mcp_tools import get_document_span, health_check_status, list_collections_summary
+from wargame_mcp.vectorstore import _compile_where, _matches_where
+
+
+class _FakeCollection:
+    """Plain collection double returning preset results and recording ``get`` calls."""
+
+    def __init__(self) -> None:
+        self.count_result = 0
+        self.get_result: dict = {"ids": [], "documents": [], "metadatas": []}
+        self.get_calls: list[dict] = []
+
+    def count(self) -> int:
+        return self.count_result
+
+    def get(self, **kwargs) -> dict:
+        self.get_calls.append(kwargs)
+        return self.get_result
+
+
+@pytest.fixture
+def fake_collection(monkeypatch):
+    # A fresh double per test: the collection index caches counts per collection identity
+    collection = _FakeCollection()
+    monkeypatch.setattr(mcp_tools, "get_collection", lambda: collection)
+    return collection
 
 
 # Chunking additional coverage
@@ -31,12 +67,9 @@ def test_read_text_utf8_encoding(tmp_path):
 
 
 # MCP tools additional coverage
-@patch("wargame_mcp.mcp_tools.get_collection")
-def test_health_check_status_returns_ok(mock_get_collection):
+def test_health_check_status_returns_ok(fake_collection):
     """Test health_check_status returns ok status."""
-    mock_collection = MagicMock()
-    mock_collection.count.return_value = 100
-    mock_get_collection.return_value = mock_collection
+    fake_collection.count_result = 100
 
     result = health_check_status()
 
@@ -44,12 +77,9 @@ def test_health_check_status_returns_ok(mock_get_collection):
     assert "100" in result["details"]
 
 
-@patch("wargame_mcp.mcp_tools.get_collection")
-def test_list_collections_summary_empty(mock_get_collection):
+def test_list_collections_summary_empty(fake_collection):
     """Test list_collections_summary with empty collection."""
-    mock_collection = MagicMock()
-    mock_collection.get.return_value = {"metadatas": []}
-    mock_get_collection.return_value = mock_collection
+    fake_collection.get_result = {"metadatas": []}
 
     result = list_collections_summary()
 
@@ -57,29 +87,20 @@ def test_list_collections_summary_empty(mock_get_collection):
     assert isinstance(result["collections"], list)
 
 
-@patch("wargame_mcp.mcp_tools.get_collection")
-def test_get_document_span_empty_collection(mock_get_collection):
+def test_get_document_span_empty_collection(fake_collection):
     """Test get_document_span with no matching chunks."""
-    mock_collection = MagicMock()
-    mock_collection.get.return_value = {"ids": [], "documents": [], "metadatas": []}
-    mock_get_collection.return_value = mock_collection
-
     result = get_document_span(document_id="nonexistent", center_chunk_index=0)
 
     assert result["chunks"] == []
 
 
-@patch("wargame_mcp.mcp_tools.get_collection")
-def test_get_document_span_invalid_span_raises(mock_get_collection):
+def test_get_document_span_invalid_span_raises(fake_collection):
     """Test get_document_span with negative span."""
     with pytest.raises(ValueError, match="span must be >= 0"):
         get_document_span(document_id="test", center_chunk_index=0, span=-1)
 
 
 # Additional agent coverage
-from wargame_mcp.agent import MCPServer, build_tool_resources, AgentConfig
-
-
 def test_mcp_server_with_env():
     """Test MCPServer with environment variables."""
     server = MCPServer(
@@ -87,7 +108,7 @@ def test_mcp_server_with_env():
         command="cmd",
         env={"KEY": "value"},
     )
-    assert server.env == {"KEY": "value"}
+    assert dict(server.env) == {"KEY": "value"}
 
 
 def test_build_tool_resources_includes_all_fields():
@@ -113,19 +134,6 @@ def test_build_tool_resources_includes_all_fields():
 
 
 # More documents coverage
-from wargame_mcp.documents import ensure_year, DocumentMetadata, DocumentChunk
-
-
-def test_ensure_year_edge_cases():
-    """Test ensure_year with edge case values."""
-    from wargame_mcp.documents import MIN_VALID_YEAR, MAX_VALID_YEAR
-
-    assert ensure_year(MIN_VALID_YEAR) == MIN_VALID_YEAR
-    assert ensure_year(MAX_VALID_YEAR) == MAX_VALID_YEAR
-    assert ensure_year(MIN_VALID_YEAR - 1) is None
-    assert ensure_year(MAX_VALID_YEAR + 1) is None
-
-
 def test_document_metadata_defaults_mutable():
     """Test that default lists don't leak between instances."""
     meta1 = DocumentMetadata(document_id="1", source_path=Path("/tmp/1.md"))
@@ -137,19 +145,12 @@ def test_document_metadata_defaults_mutable():
     assert "tag1" not in meta2.tags
 
 
-def test_document_chunk_metadata_includes_all_fields():
+def test_document_chunk_metadata_includes_all_fields(ro_metadata):
     """Test that chroma_metadata includes all required fields."""
-    metadata = DocumentMetadata(
-        document_id="doc-1",
-        source_path=Path("/test.md"),
-        collection="test",
-        title="Test Title",
-        year=2024,
-    )
     chunk = DocumentChunk(
         id="chunk-1",
         text="Text",
-        metadata=metadata,
+        metadata=ro_metadata,
         chunk_index=5,
         chunk_count=10,
     )
@@ -162,3 +163,204 @@ def test_document_chunk_metadata_includes_all_fields():
     assert chroma_meta["year"] == 2024
     assert chroma_meta["chunk_index"] == 5
     assert chroma_meta["chunk_count"] == 10
+
+
+def test_iter_documents_skips_hidden_directories(tmp_path):
+    """Test iter_documents does not descend into dot-directories."""
+    hidden = tmp_path / ".git"
+    hidden.mkdir()
+    (hidden / "notes.md").write_text("# Hidden")
+    (tmp_path / "UPPER.MD").write_text("# Upper")
+
+    docs = list(iter_documents(tmp_path))
+    assert [d.name for d in docs] == ["UPPER.MD"]
+
+
+def test_build_tool_resources_returns_independent_manifests():
+    """Test each call returns a fresh manifest that callers can modify safely."""
+    first = build_tool_resources(AgentConfig())
+    second = build_tool_resources(AgentConfig())
+    other = build_tool_resources(AgentConfig(mem0_server=None))
+
+    assert first == second
+    assert first is not second
+    first["mcp"][0]["env"]["LEAKED"] = "1"
+    first["mcp"].pop()
+    assert build_tool_resources(AgentConfig()) == second
+    assert other != second
+    assert [server["server_name"] for server in second["mcp"]] == [
+        "wargame-rag-mcp",
+        "wargame-mem0-mcp",
+    ]
+
+
+def test_build_agent_payload_system_message_is_not_shared():
+    """Test editing one payload's system message does not leak into the next payload."""
+    payload = build_agent_payload(config=AgentConfig(), question="q", user_id="u")
+    payload["input"][0]["content"] = "edited"
+
+    again = build_agent_payload(config=AgentConfig(), question="q", user_id="u")
+    assert again["input"][0] == {"role": "system", "content": SYSTEM_PROMPT}
+
+
+def test_mcp_server_is_frozen_and_hashable():
+    """Test MCPServer equality/hash covers env contents and rejects mutation."""
+    server = MCPServer(server_name="s", command="c", env={"A": "1", "B": "2"})
+    same = MCPServer(server_name="s", command="c", env={"B": "2", "A": "1"})
+
+    assert server == same
+    assert hash(server) == hash(same)
+    assert server.env == (("A", "1"), ("B", "2"))
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        server.command = "other"  # type: ignore[misc]
+
+
+def test_list_collections_summary_fetches_first_chunks_only(fake_collection):
+    """Test list_collections_summary filters to chunk 0 and counts documents per collection."""
+    fake_collection.get_result = {
+        "metadatas": [
+            {"collection": "doctrine", "document_id": "a", "chunk_index": 0},
+            {"collection": "doctrine", "document_id": "b", "chunk_index": 0},
+            {"collection": "history", "document_id": "c", "chunk_index": 0},
+        ]
+    }
+
+    result = list_collections_summary()
+
+    assert fake_collection.get_calls == [{"where": {"chunk_index": 0}, "include": ["metadatas"]}]
+    assert [(c["name"], c["document_count"]) for c in result["collections"]] == [
+        ("doctrine", 2),
+        ("history", 1),
+    ]
+
+
+def test_get_document_span_filters_window_in_query(fake_collection):
+    """Test get_document_span asks the store for the chunk window only."""
+    fake_collection.get_result = {
+        "ids": ["d:4", "d:3"],
+        "documents": ["four", "three"],
+        "metadatas": [{"chunk_index": 4}, {"chunk_index": 3}],
+    }
+
+    result = get_document_span(document_id="d", center_chunk_index=3, span=1)
+
+    (call,) = fake_collection.get_calls
+    where = call["where"]
+    assert where == {
+        "$and": [
+            {"document_id": "d"},
+            {"chunk_index": {"$gte": 2}},
+            {"chunk_index": {"$lte": 4}},
+        ]
+    }
+    assert [chunk["chunk_index"] for chunk in result["chunks"]] == [3, 4]
+
+
+def test_fallback_where_supports_range_filters():
+    """Test the in-memory store evaluates $and/$gte/$lte/$in filters like Chroma."""
+    metadata = {"document_id": "d", "chunk_index": 3, "collection": "aar"}
+    assert _matches_where(
+        metadata, {"$and": [{"document_id": "d"}, {"chunk_index": {"$gte": 2, "$lte": 3}}]}
+    )
+    assert not _matches_where(metadata, {"chunk_index": {"$gt": 3}})
+    assert _matches_where(metadata, {"collection": {"$in": ["aar", "intel"]}})
+    assert not _matches_where(metadata, {"$or": [{"document_id": "x"}, {"chunk_index": 9}]})
+
+
+def test_compiled_where_handles_membership_edge_cases():
+    """Test compiled $in/$nin predicates cope with unhashable values and combine clauses."""
+    in_collections = _compile_where({"collection": {"$in": ["aar", "intel"]}, "chunk_index": 0})
+    assert in_collections({"collection": "aar", "chunk_index": 0})
+    assert not in_collections({"collection": "aar", "chunk_index": 1})
+    assert not in_collections({"collection": ["aar"], "chunk_index": 0})
+    assert _compile_where({"collection": {"$nin": ["aar"]}})({"collection": ["aar"]})
+    assert _compile_where({"tags": {"$in": [["a"], "b"]}})({"tags": ["a"]})
+
+
+def test_collection_index_is_maintained_by_writes(monkeypatch):
+    """Test document counts are served from the index and updated by upserts and deletes."""
+    collection = MagicMock()
+    collection.get.return_value = {
+        "metadatas": [{"collection": "aar", "document_id": "a", "chunk_index": 0}]
+    }
+    monkeypatch.setattr(vectorstore, "_use_fallback_store", lambda: False)
+    monkeypatch.setattr(vectorstore, "get_collection", lambda: collection)
+    monkeypatch.setattr(vectorstore, "_collection_index", vectorstore._CollectionIndex())
+
+    assert vectorstore.collection_document_counts() == {"aar": 1}
+    metadata = DocumentMetadata(document_id="b", source_path=Path("b.md"), collection="intel")
+    vectorstore.upsert_chunks([DocumentChunk("b:0", "text", metadata, 0, 1)], [[1.0, 0.0]])
+    vectorstore.delete_document("a")
+
+    assert vectorstore.collection_document_counts() == {"intel": 1}
+    assert collection.get.call_count == 1
+
+
+def test_upsert_chunks_splits_chroma_writes_into_batches(monkeypatch):
+    """Test Chroma upserts are issued in slices of at most batch_size chunks."""
+    collection = MagicMock()
+    monkeypatch.setattr(vectorstore, "_use_fallback_store", lambda: False)
+    monkeypatch.setattr(vectorstore, "get_collection", lambda: collection)
+    metadata = DocumentMetadata(document_id="d", source_path=Path("d.md"))
+    chunks = [DocumentChunk(f"d:{i}", "t", metadata, i, 5) for i in range(5)]
+
+    vectorstore.upsert_chunks(chunks, [[1.0, 0.0]] * 5, batch_size=2)
+
+    sent = [call.kwargs["ids"] for call in collection.upsert.call_args_list]
+    assert sent == [["d:0", "d:1"], ["d:2", "d:3"], ["d:4"]]
+
+
+def test_get_document_span_records_latency(fake_collection):
+    """Test document span lookups are tracked under the get_doc_span operation."""
+    before = latencies.summary().get("get_doc_span", {}).get("count", 0)
+
+    get_document_span(document_id="d", center_chunk_index=0, correlation_id="cid-1")
+
+    assert latencies.summary()["get_doc_span"]["count"] == before + 1
+
+
+def test_fallback_get_uses_document_index(monkeypatch):
+    """Test document-pinned fallback lookups use the per-document row index."""
+    if not vectorstore._use_fallback_store():
+        pytest.skip("chromadb installed; fallback store not in use")
+    monkeypatch.setattr(vectorstore, "_fallback_store", [])
+    chunks = [
+        DocumentChunk(f"{doc}:{i}", f"{doc}{i}", DocumentMetadata(doc, Path(f"{doc}.md")), i, 3)
+        for doc in ("a", "b")
+        for i in range(3)
+    ]
+    vectorstore.upsert_chunks(chunks, [[1.0, 0.0]] * len(chunks))
+    collection = vectorstore._FallbackCollection()
+    where = {"$and": [{"document_id": "b"}, {"chunk_index": {"$gte": 1}}]}
+
+    assert collection.get(where=where)["ids"] == [["b:1", "b:2"]]
+    assert collection.get(where={"document_id": {"$eq": "a"}})["ids"] == [["a:0", "a:1", "a:2"]]
+    assert collection.get(where={"document_id": "missing"})["ids"] == [[]]
+
+    vectorstore.delete_document("b")
+    assert collection.get(where={"document_id": "b"})["ids"] == [[]]
+    assert collection.count() == 3
+
+
+def test_fallback_document_index_waits_for_writers(monkeypatch):
+    """Test a rebuild during a write blocks until the write finishes instead of caching it."""
+    import threading
+
+    store: list[dict] = []
+    monkeypatch.setattr(vectorstore, "_fallback_store", store)
+    monkeypatch.setattr(vectorstore, "_fallback_documents", None)
+    seen: list[dict] = []
+    with vectorstore._fallback_lock:
+        store.append({"id": "a:0", "metadata": {"document_id": "a"}})
+        reader = threading.Thread(
+            target=lambda: seen.append(vectorstore._fallback_rows_by_document())
+        )
+        reader.start()
+        reader.join(timeout=0.05)
+        assert reader.is_alive()
+        store.append({"id": "a:1", "metadata": {"document_id": "a"}})
+        vectorstore._invalidate_fallback_documents()
+    reader.join()
+
+    assert [entry["id"] for entry in seen[0]["a"]] == ["a:0", "a:1"]
+    assert vectorstore._fallback_rows_by_document() is seen[0]
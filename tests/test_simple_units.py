@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -22,28 +23,18 @@ from wargame_mcp.vectorstore import SearchResult
 
 
 # Document tests
-def test_document_metadata_creation():
+def test_document_metadata_creation(ro_metadata):
     """Test creating DocumentMetadata."""
-    metadata = DocumentMetadata(
-        document_id="doc-123",
-        source_path=Path("/tmp/test.md"),
-        collection="test",
-    )
-    assert metadata.document_id == "doc-123"
-    assert metadata.collection == "test"
+    assert ro_metadata.document_id == "doc-1"
+    assert ro_metadata.collection == "test"
 
 
-def test_document_chunk_chroma_metadata():
+def test_document_chunk_chroma_metadata(ro_metadata):
     """Test DocumentChunk.chroma_metadata()."""
-    metadata = DocumentMetadata(
-        document_id="doc-1",
-        source_path=Path("/test.md"),
-        collection="test",
-    )
     chunk = DocumentChunk(
         id="chunk-1",
         text="Test",
-        metadata=metadata,
+        metadata=ro_metadata,
         chunk_index=2,
         chunk_count=10,
     )
@@ -70,18 +61,20 @@ def test_ingestion_summary_as_dict():
     assert result["token_count"] == 5000
 
 
-def test_ensure_year_valid():
-    """Test ensure_year with valid years."""
-    assert ensure_year(2024) == 2024
-    assert ensure_year(MIN_VALID_YEAR) == MIN_VALID_YEAR
-    assert ensure_year(MAX_VALID_YEAR) == MAX_VALID_YEAR
-
-
-def test_ensure_year_invalid():
-    """Test ensure_year with invalid years."""
-    assert ensure_year(1899) is None
-    assert ensure_year(2101) is None
-    assert ensure_year(None) is None
+@pytest.mark.parametrize(
+    ("year", "expected"),
+    [
+        (2024, 2024),
+        (MIN_VALID_YEAR, MIN_VALID_YEAR),
+        (MAX_VALID_YEAR, MAX_VALID_YEAR),
+        (MIN_VALID_YEAR - 1, None),
+        (MAX_VALID_YEAR + 1, None),
+        (None, None),
+    ],
+)
+def test_ensure_year(year, expected):
+    """Test ensure_year keeps years within the valid range and drops the rest."""
+    assert ensure_year(year) == expected
 
 
 def test_slugify_basic():
@@ -91,27 +84,37 @@ def test_slugify_basic():
     assert "world" in result.lower()
 
 
+def test_slugify_collapses_separators_and_keeps_unicode():
+    """Test slugify collapses separator runs for ASCII and non-ASCII input."""
+    assert slugify("--Hello,  World!--") == "hello-world"
+    assert slugify("Übung: Straße 2") == "übung-straße-2"
+    assert slugify("***") == ""
+
+
 # Embeddings tests
-def test_fake_embedding_provider_basic():
+@pytest.fixture(scope="module")
+def fake_provider():
+    """A plain FakeEmbeddingProvider; unlike ``fake_embedder`` it hashes on every call."""
+    return FakeEmbeddingProvider()
+
+
+def test_fake_embedding_provider_basic(fake_provider):
     """Test FakeEmbeddingProvider generates embeddings."""
-    provider = FakeEmbeddingProvider()
-    embeddings = provider.embed(["test"])
+    embeddings = fake_provider.embed(["test"])
     assert len(embeddings) == 1
     assert len(embeddings[0]) > 0
 
 
-def test_fake_embedding_provider_deterministic():
+def test_fake_embedding_provider_deterministic(fake_provider):
     """Test that FakeEmbeddingProvider is deterministic."""
-    provider = FakeEmbeddingProvider()
-    emb1 = provider.embed(["test"])
-    emb2 = provider.embed(["test"])
+    emb1 = fake_provider.embed(["test"])
+    emb2 = fake_provider.embed(["test"])
     assert emb1 == emb2
 
 
-def test_fake_embedding_provider_empty_list():
+def test_fake_embedding_provider_empty_list(fake_provider):
     """Test FakeEmbeddingProvider with empty list."""
-    provider = FakeEmbeddingProvider()
-    embeddings = provider.embed([])
+    embeddings = fake_provider.embed([])
     assert embeddings == []
 
 
@@ -173,26 +176,682 @@ def test_serialize_search_hit_preserves_metadata():
     assert result["metadata"]["collection"] == "nato"
 
 
-# Vectorstore tests
-def test_search_result_creation():
-    """Test SearchResult dataclass."""
-    result = SearchResult(
-        id="chunk-123",
-        text="Test chunk text",
-        score=0.95,
-        metadata={"collection": "test"},
+# Package namespace tests
+def test_package_exposes_submodules_lazily():
+    """Test submodules listed in __all__ resolve through the package namespace."""
+    import wargame_mcp
+
+    assert wargame_mcp.documents.slugify("A B") == "a-b"
+    assert "vectorstore" in dir(wargame_mcp)
+    with pytest.raises(AttributeError):
+        _ = wargame_mcp.not_a_module
+
+
+# Logging fallback tests
+def test_structlog_fallback_renders_on_listener_thread(capsys):
+    """Test fallback records are queued, snapshotted and rendered as JSON by the listener."""
+    import logging
+
+    from wargame_mcp import _structlog_fallback
+
+    root = logging.getLogger()
+    previous_handlers, previous_level = root.handlers[:], root.level
+    previous_listener = _structlog_fallback._listener
+    hits = ["a"]
+    try:
+        # pytest attaches its own capture handlers; start from an unconfigured root
+        root.handlers = []
+        _structlog_fallback.configure()
+        _structlog_fallback.configure()
+        assert [type(h) for h in root.handlers] == [_structlog_fallback._DeferredQueueHandler]
+        _structlog_fallback.get_logger("test").info("queued", count=2, hits=hits)
+        hits.append("b")
+        _structlog_fallback._stop_listener()
+    finally:
+        root.handlers, root.level = previous_handlers, previous_level
+        _structlog_fallback._listener = previous_listener
+        if previous_listener is not None:
+            previous_listener.start()
+
+    emitted = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    assert emitted == [{"event": "queued", "count": 2, "hits": ["a"]}]
+
+
+def test_structlog_fallback_leaves_configured_logging_alone():
+    """Test configure keeps a host's root handlers and adds no second output path."""
+    import logging
+
+    from wargame_mcp import _structlog_fallback
+
+    class _Capture(logging.Handler):
+        def __init__(self) -> None:
+            super().__init__()
+            self.messages: list[str] = []
+
+        def emit(self, record: logging.LogRecord) -> None:
+            self.messages.append(record.getMessage())
+
+    root = logging.getLogger()
+    previous_handlers, previous_level = root.handlers[:], root.level
+    previous_listener = _structlog_fallback._listener
+    existing = _Capture()
+    try:
+        root.handlers = [existing]
+        _structlog_fallback.configure()
+        assert root.handlers == [existing]
+        assert _structlog_fallback._listener is previous_listener
+        root.setLevel(logging.INFO)
+        _structlog_fallback.get_logger("test").info("hosted", count=1)
+    finally:
+        root.handlers, root.level = previous_handlers, previous_level
+
+    assert [json.loads(message) for message in existing.messages] == [
+        {"event": "hosted", "count": 1}
+    ]
+
+
+def test_log_events_go_to_stderr_not_stdout():
+    """Test log events never reach stdout, which carries the MCP stdio protocol."""
+    import os
+    import subprocess
+    import sys
+
+    import wargame_mcp
+
+    code = "from wargame_mcp.instrumentation import logger; logger.info('probe', value=1)"
+    src = str(Path(wargame_mcp.__file__).resolve().parents[1])
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": src},
     )
-    assert result.id == "chunk-123"
-    assert result.text == "Test chunk text"
-    assert result.score == 0.95
 
+    assert result.stdout == ""
+    assert '"probe"' in result.stderr
 
-def test_search_result_with_empty_metadata():
-    """Test SearchResult with empty metadata."""
-    result = SearchResult(
-        id="chunk-1",
-        text="Text",
-        score=0.8,
-        metadata={},
+
+def test_fake_embeddings_parallel_digests_match_serial(monkeypatch):
+    """Test thread-pooled hashing yields the same vectors in the same order."""
+    from wargame_mcp import embeddings
+
+    provider = FakeEmbeddingProvider(dimensions=40)
+    texts = [f"chunk {i}" * 300 for i in range(80)]
+    parallel = provider.embed(texts)
+    monkeypatch.setattr(embeddings, "_PARALLEL_DIGEST_MIN_TEXTS", len(texts) + 1)
+
+    assert parallel == provider.embed(texts)
+
+
+def test_sha256_digests_reuse_one_thread_pool(monkeypatch):
+    """Test large digest batches share one lazily created executor across calls."""
+    import hashlib
+
+    from wargame_mcp import embeddings
+
+    monkeypatch.setattr(embeddings, "_DIGEST_WORKERS", 2)
+    monkeypatch.setattr(embeddings, "_digest_pool", None)
+    payloads = [str(i).encode() for i in range(embeddings._PARALLEL_DIGEST_MIN_TEXTS)]
+
+    first = embeddings._sha256_digests(payloads)
+    pool = embeddings._digest_pool
+    try:
+        assert embeddings._sha256_digests(payloads) == first
+        assert embeddings._digest_pool is pool is not None
+    finally:
+        pool.shutdown()
+    assert first == [hashlib.sha256(payload).digest() for payload in payloads]
+
+
+def test_build_embedding_provider_reuses_openai_client(monkeypatch):
+    """Test real providers are shared per configuration instead of rebuilt per call."""
+    from wargame_mcp import embeddings
+    from wargame_mcp.config import SETTINGS
+
+    monkeypatch.setattr(SETTINGS, "openai_api_key", "sk-test")
+    monkeypatch.setattr(SETTINGS, "redis_url", None)
+    embeddings._shared_openai_provider.cache_clear()
+    try:
+        first = build_embedding_provider()
+        assert build_embedding_provider() is first
+        monkeypatch.setattr(SETTINGS, "embedding_model", "other-model")
+        assert build_embedding_provider() is not first
+    finally:
+        embeddings._shared_openai_provider.cache_clear()
+
+
+def test_chunk_batch_metadatas_match_per_chunk_metadata():
+    """Test ChunkBatch columns reproduce DocumentChunk.chroma_metadata()."""
+    from wargame_mcp.documents import ChunkBatch
+
+    metadata = DocumentMetadata(
+        document_id="doc-1", source_path=Path("/test.md"), tags=["a", "b"]
+    )
+    chunks = [
+        DocumentChunk(id=f"doc-1:{i}", text=str(i), metadata=metadata, chunk_index=i, chunk_count=2)
+        for i in range(2)
+    ]
+
+    batch = ChunkBatch.from_chunks(chunks)
+
+    assert len(batch) == 2
+    assert batch.ids == ["doc-1:0", "doc-1:1"]
+    assert batch.to_chroma_metadatas() == [chunk.chroma_metadata() for chunk in chunks]
+    assert [m["tags"] for m in batch.to_chroma_metadatas(tag_separator=",")] == ["a,b", "a,b"]
+
+    padded = DocumentMetadata(document_id="d", source_path=Path("d.md"), tags=[" a ", "", "b"])
+    padded_batch = ChunkBatch.from_chunks([DocumentChunk("d:0", "t", padded, 0, 1)])
+    assert padded_batch.to_chroma_metadatas(tag_separator=",")[0]["tags"] == "a,b"
+
+
+def test_build_document_id_is_stable():
+    """Test document ids are deterministic digests of the path."""
+    import os
+    import subprocess
+    import sys
+
+    import wargame_mcp
+    from wargame_mcp.documents import build_document_id
+
+    path = Path("docs/a.md")
+    code = (
+        "from pathlib import Path; from wargame_mcp.documents import build_document_id;"
+        "print(build_document_id(Path('docs/a.md'), title='A Doc'))"
+    )
+    src = str(Path(wargame_mcp.__file__).resolve().parents[1])
+    other_process = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": src},
+    ).stdout.strip()
+
+    assert build_document_id(path, title="A Doc") == other_process
+    assert other_process.startswith("a-doc-")
+    assert build_document_id(path).startswith("doc-")
+    assert build_document_id(path) != build_document_id(Path("docs/b.md"))
+
+
+def test_cli_snippet_truncates_and_flattens_newlines():
+    """Test CLI snippets are single-line and truncated with an ellipsis."""
+    from wargame_mcp.cli import SNIPPET_MAX_LENGTH, _snippet
+
+    assert _snippet("a\nb") == "a b"
+    long_text = "x" * (SNIPPET_MAX_LENGTH + 5)
+    assert _snippet(long_text) == "x" * SNIPPET_MAX_LENGTH + "…"
+
+
+def test_quantize_int8_round_trip():
+    """Test int8 quantization keeps components within one quantization step."""
+    from wargame_mcp._vecmath import dequantize_int8, quantize_int8
+
+    values, scale = quantize_int8([0.2, -0.4, 0.1])
+    assert values.tolist() == [64, -127, 32]
+    restored = dequantize_int8(values, scale)
+    assert all(abs(a - b) <= scale for a, b in zip(restored, [0.2, -0.4, 0.1], strict=True))
+    assert quantize_int8([0.0, 0.0])[1] == 0.0
+
+
+def test_embed_quantized_matches_embed():
+    """Test embed_quantized returns one int8 vector and scale per text."""
+    provider = FakeEmbeddingProvider(dimensions=8)
+    vectors, scales = provider.embed_quantized(["a", "b"])
+    assert len(vectors) == len(scales) == 2
+    assert all(len(vector) == 8 and vector.typecode == "b" for vector in vectors)
+
+
+def test_fallback_store_int8_quantization_preserves_ranking(monkeypatch):
+    """Test int8-quantized fallback storage still ranks the matching chunk first."""
+    from wargame_mcp import vectorstore
+    from wargame_mcp.config import SETTINGS
+    from wargame_mcp.documents import DocumentChunk, DocumentMetadata
+
+    if not vectorstore._use_fallback_store():
+        pytest.skip("chromadb installed; fallback store not in use")
+    monkeypatch.setattr(SETTINGS, "embedding_quantization", "int8")
+    monkeypatch.setattr(vectorstore, "_fallback_store", [])
+    provider = FakeEmbeddingProvider(dimensions=64)
+    metadata = DocumentMetadata(document_id="doc", source_path=Path("doc.md"))
+    texts = ["alpha", "bravo", "charlie"]
+    chunks = [DocumentChunk(f"doc:{i}", t, metadata, i, len(texts)) for i, t in enumerate(texts)]
+    vectorstore.upsert_chunks(chunks, provider.embed(texts))
+
+    assert vectorstore._fallback_store[0]["embedding"].typecode == "b"
+    hits = vectorstore.query("bravo", top_k=1, embedding_provider=provider)
+    assert hits[0].id == "doc:1"
+
+
+def test_openai_provider_requests_truncated_normalized_vectors():
+    """Test EMBEDDING_DIMENSIONS is forwarded to the API and results are L2-normalized."""
+    from types import SimpleNamespace
+
+    from wargame_mcp.embeddings import OpenAIEmbeddingProvider
+
+    class _Embeddings:
+        def __init__(self) -> None:
+            self.kwargs: dict = {}
+
+        def create(self, **kwargs):
+            self.kwargs = kwargs
+            return SimpleNamespace(data=[SimpleNamespace(embedding=[3.0, 4.0])])
+
+    provider = OpenAIEmbeddingProvider(model="text-embedding-3-small", api_key="k", dimensions=2)
+    provider._fallback = None
+    provider._cache = None
+    provider.client = SimpleNamespace(embeddings=_Embeddings())
+
+    assert provider.embed(["x"]) == [pytest.approx([0.6, 0.8])]
+    assert provider.client.embeddings.kwargs["dimensions"] == 2
+    assert provider.cache_namespace == "text-embedding-3-small:2d"
+
+
+def test_get_collection_configures_hnsw_index(monkeypatch):
+    """Test new Chroma collections are created with tuned cosine HNSW parameters."""
+    from types import SimpleNamespace
+
+    from wargame_mcp import vectorstore
+    from wargame_mcp.config import SETTINGS
+
+    created: dict = {}
+
+    class _Client:
+        def get_or_create_collection(self, **kwargs):
+            created.update(kwargs)
+            return "collection"
+
+    fake_chromadb = SimpleNamespace(api=SimpleNamespace(types=SimpleNamespace()))
+    monkeypatch.setattr(vectorstore, "_use_fallback_store", lambda: False)
+    monkeypatch.setattr(vectorstore, "_client", _Client)
+    monkeypatch.setattr(vectorstore, "_import_chromadb", lambda: fake_chromadb)
+    monkeypatch.setattr(vectorstore, "_cached_collection", None)
+
+    assert vectorstore.get_collection() == "collection"
+    assert created["metadata"]["hnsw:space"] == "ip"
+    assert created["metadata"]["hnsw:M"] == 32
+    assert created["metadata"]["hnsw:search_ef"] == 128
+
+    monkeypatch.setattr(SETTINGS, "hnsw_ef_search", 40)
+    monkeypatch.setattr(vectorstore, "_cached_collection", None)
+    vectorstore.get_collection()
+    assert created["metadata"]["hnsw:search_ef"] == 40
+
+
+def test_cli_help_does_not_import_heavy_modules():
+    """Test `--help` renders without importing ingest, embeddings or vectorstore."""
+    import os
+    import subprocess
+    import sys
+
+    import wargame_mcp
+
+    code = (
+        "import sys; from typer.testing import CliRunner; from wargame_mcp.cli import app;"
+        "result = CliRunner().invoke(app, ['--help']); assert result.exit_code == 0;"
+        "print(sorted(m for m in sys.modules if m.startswith('wargame_mcp.')))"
+    )
+    src = str(Path(wargame_mcp.__file__).resolve().parents[1])
+    loaded = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": src},
+    ).stdout.strip()
+
+    for heavy in ("ingest", "embeddings", "vectorstore", "mcp_tools"):
+        assert f"wargame_mcp.{heavy}'" not in loaded
+
+
+def test_openai_provider_streams_texts_in_request_sized_batches(monkeypatch):
+    """Test generators are embedded in EMBED_BATCH_SIZE slices in input order."""
+    from wargame_mcp.config import SETTINGS
+    from wargame_mcp.embeddings import OpenAIEmbeddingProvider
+
+    monkeypatch.setattr(SETTINGS, "embed_batch_size", 2)
+    provider = OpenAIEmbeddingProvider(model="m", api_key="k")
+    provider._fallback = None
+    provider._cache = None
+    calls: list[list[str]] = []
+
+    def _remote(texts):
+        calls.append(texts)
+        return [[float(text)] for text in texts]
+
+    monkeypatch.setattr(provider, "_embed_remote", _remote)
+
+    vectors = provider.embed(str(i) for i in range(5))
+
+    assert calls == [["0", "1"], ["2", "3"], ["4"]]
+    assert vectors == [[0.0], [1.0], [2.0], [3.0], [4.0]]
+
+
+def test_cosine_similarity_matches_reference():
+    """Test the vectorized cosine helper matches the textbook formula, with truncation."""
+    from wargame_mcp.vectorstore import _cosine_similarity
+
+    a = [0.1, -0.5, 0.3, 0.9]
+    b = [0.4, 0.2, -0.7, 0.05]
+    dot = sum(x * y for x, y in zip(a, b, strict=True))
+    norms = sum(x * x for x in a) ** 0.5 * sum(y * y for y in b) ** 0.5
+    expected = (dot / norms + 1) / 2
+
+    assert _cosine_similarity(a, b) == pytest.approx(expected)
+    assert _cosine_similarity(a, b, sum(x * x for x in a) ** 0.5) == pytest.approx(expected)
+    assert _cosine_similarity(a + [5.0], b, 1.0) == pytest.approx(expected)
+    assert _cosine_similarity([0.0, 0.0], b) == 0.0
+    assert _cosine_similarity([], b) == 0.0
+    norm_b = sum(x * x for x in b) ** 0.5
+    assert _cosine_similarity(a, b, None, norm_b) == pytest.approx(expected)
+    assert _cosine_similarity(a, b + [5.0], None, 1.0) == pytest.approx(expected)
+
+
+def test_cli_list_collections_reports_document_counts(monkeypatch):
+    """Test list-collections renders the shared per-collection document summary."""
+    from typer.testing import CliRunner
+
+    from wargame_mcp import mcp_tools
+    from wargame_mcp.cli import app
+
+    summary = {"collections": [{"name": "doctrine", "document_count": 3, "description": ""}]}
+    monkeypatch.setattr(mcp_tools, "list_collections_summary", lambda: summary)
+
+    result = CliRunner().invoke(app, ["list-collections"])
+
+    assert result.exit_code == 0
+    assert "doctrine" in result.output
+    assert "3" in result.output
+
+
+def test_upsert_chunks_stores_unit_length_vectors(monkeypatch):
+    """Test stored vectors are L2-normalized so inner product equals cosine similarity."""
+    import math
+
+    from wargame_mcp import vectorstore
+
+    if not vectorstore._use_fallback_store():
+        pytest.skip("chromadb installed; fallback store not in use")
+    monkeypatch.setattr(vectorstore, "_fallback_store", [])
+    metadata = DocumentMetadata(document_id="doc", source_path=Path("doc.md"))
+    chunk = DocumentChunk("doc:0", "alpha", metadata, 0, 1)
+
+    vectorstore.upsert_chunks([chunk], [[3.0, 4.0]])
+
+    assert vectorstore._fallback_store[0]["embedding"].typecode == "f"
+    assert list(vectorstore._fallback_store[0]["embedding"]) == pytest.approx([0.6, 0.8])
+    assert math.hypot(*vectorstore._fallback_store[0]["embedding"]) == pytest.approx(1.0)
+
+
+def test_latency_recorder_aggregates_concurrent_observations():
+    """Test per-operation counters stay exact when tools record from many threads."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from wargame_mcp.instrumentation import LatencyRecorder
+
+    recorder = LatencyRecorder()
+
+    def _observe(i: int) -> None:
+        recorder.observe(f"op{i % 2}", 1_500_000 if i else 4_000_000, error=i % 10 == 0)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(_observe, range(1000)))
+
+    summary = recorder.summary()
+    assert summary["op0"]["count"] == 500
+    assert summary["op0"]["errors"] == 100
+    assert summary["op0"]["max_ms"] == 4.0
+    assert summary["op1"]["avg_ms"] == pytest.approx(1.5)
+
+
+def test_exception_renderers_run_only_for_events_that_need_them(monkeypatch):
+    """Test stack/exception rendering is skipped for plain log events."""
+    from wargame_mcp import instrumentation
+
+    calls: list[dict] = []
+
+    def _renderer(_logger, _method, event_dict):
+        calls.append(event_dict)
+        return event_dict
+
+    monkeypatch.setattr(instrumentation, "_stack_info_renderer", _renderer)
+
+    plain = {"event": "latency"}
+    assert instrumentation._render_exceptions(None, "info", plain) is plain
+    assert calls == []
+    instrumentation._render_exceptions(None, "error", {"event": "boom", "exc_info": True})
+    assert len(calls) == 1
+
+
+def test_get_collection_reuses_handle_until_settings_change(monkeypatch):
+    """Test the Chroma handle is opened once per configured path and collection name."""
+    from types import SimpleNamespace
+
+    from wargame_mcp import vectorstore
+    from wargame_mcp.config import SETTINGS
+
+    opened: list[str] = []
+
+    class _Client:
+        def get_or_create_collection(self, **kwargs):
+            opened.append(kwargs["name"])
+            return object()
+
+    fake_chromadb = SimpleNamespace(api=SimpleNamespace(types=SimpleNamespace()))
+    monkeypatch.setattr(vectorstore, "_use_fallback_store", lambda: False)
+    monkeypatch.setattr(vectorstore, "_client", _Client)
+    monkeypatch.setattr(vectorstore, "_import_chromadb", lambda: fake_chromadb)
+    monkeypatch.setattr(vectorstore, "_cached_collection", None)
+
+    first = vectorstore.get_collection()
+    assert vectorstore.get_collection() is first
+    monkeypatch.setattr(SETTINGS, "chroma_collection", "other")
+    assert vectorstore.get_collection() is not first
+    assert opened == [opened[0], "other"]
+
+
+def test_correlation_scope_generates_and_reuses_ids():
+    """Test new correlation ids are 16 hex chars and nested scopes inherit them."""
+    from wargame_mcp.instrumentation import correlation_scope, get_correlation_id
+
+    with correlation_scope() as outer:
+        assert len(outer) == 16
+        int(outer, 16)
+        with correlation_scope() as inner:
+            assert inner == outer
+        with correlation_scope("explicit") as explicit:
+            assert get_correlation_id() == explicit == "explicit"
+    assert get_correlation_id() is None
+
+
+def test_track_latency_skips_log_event_when_info_disabled(monkeypatch):
+    """Test latency is still recorded but no INFO event is built when INFO is filtered."""
+    import logging
+
+    from wargame_mcp import instrumentation
+
+    events: list[str] = []
+    monkeypatch.setattr(instrumentation.logger, "info", lambda event, **_: events.append(event))
+    package_logger = logging.getLogger("wargame_mcp")
+    previous = package_logger.level
+    package_logger.setLevel(logging.WARNING)
+    try:
+        assert not instrumentation.info_enabled()
+        with instrumentation.track_latency("quiet_op"):
+            pass
+    finally:
+        package_logger.setLevel(previous)
+
+    assert events == []
+    assert instrumentation.latencies.summary()["quiet_op"]["count"] >= 1
+    with instrumentation.track_latency("loud_op"):
+        pass
+    assert events == ["latency"]
+
+
+def test_fallback_logger_bind_merges_context():
+    """Test bound fallback loggers prepend their context to every event."""
+    from types import SimpleNamespace
+
+    from wargame_mcp import _structlog_fallback
+
+    messages: list[object] = []
+    bound = _structlog_fallback.get_logger("wargame_mcp").bind(tool_name="memory_add")
+    bound._logger = SimpleNamespace(info=messages.append)
+    assert bound.bind(user_id="u").context == {"tool_name": "memory_add", "user_id": "u"}
+    bound.info("done", status="ok")
+    assert json.loads(str(messages[0])) == {
+        "event": "done",
+        "tool_name": "memory_add",
+        "status": "ok",
+    }
+
+
+def test_correlation_scope_run_isolates_context():
+    """Test correlation_scope_run binds the id only for the wrapped call."""
+    from wargame_mcp.instrumentation import correlation_scope_run, get_correlation_id
+
+    assert correlation_scope_run("run-id", get_correlation_id) == "run-id"
+    assert get_correlation_id() is None
+    generated = correlation_scope_run(None, get_correlation_id)
+    assert generated is not None
+    assert len(generated) == 16
+
+
+def test_correlation_scope_set_stays_inside_to_thread_context():
+    """Test ids bound in an asyncio.to_thread worker never leak into the caller's context."""
+    import asyncio
+
+    from wargame_mcp.instrumentation import correlation_scope_set, get_correlation_id
+
+    async def _main():
+        inside = await asyncio.to_thread(correlation_scope_set, "worker-id", get_correlation_id)
+        return inside, get_correlation_id()
+
+    assert asyncio.run(_main()) == ("worker-id", None)
+
+
+def test_track_latency_logs_caller_fields(monkeypatch):
+    """Test the latency event carries caller fields alongside the timing fields."""
+    from wargame_mcp import instrumentation
+
+    events: list[dict] = []
+    monkeypatch.setattr(instrumentation.logger, "info", lambda event, **kw: events.append(kw))
+    with instrumentation.correlation_scope("cid"), instrumentation.track_latency(
+        "fields_op", tool_name="t"
+    ):
+        pass
+
+    (event,) = events
+    assert event["tool_name"] == "t"
+    assert event["operation"] == "fields_op"
+    assert event["correlation_id"] == "cid"
+    assert event["error"] is False
+
+    with pytest.raises(TypeError), instrumentation.track_latency("clash_op", error="caller"):
+        pass
+
+
+def test_fallback_query_ranks_filters_and_limits(monkeypatch):
+    """Test fallback queries honour where filters, min_score and top_k ordering."""
+    from types import SimpleNamespace
+
+    from wargame_mcp import vectorstore
+    from wargame_mcp.documents import DocumentChunk, DocumentMetadata
+
+    if not vectorstore._use_fallback_store():
+        pytest.skip("chromadb installed; fallback store not in use")
+    monkeypatch.setattr(vectorstore, "_fallback_store", [])
+    doctrine = DocumentMetadata(
+        document_id="d", source_path=Path("d.md"), collection="doctrine", tags=["x", "y"]
     )
-    assert result.metadata == {}
+    intel = DocumentMetadata(document_id="i", source_path=Path("i.md"), collection="intel")
+    chunks = [
+        DocumentChunk("d:0", "near", doctrine, 0, 3),
+        DocumentChunk("d:1", "far", doctrine, 1, 3),
+        DocumentChunk("d:2", "opposite", doctrine, 2, 3),
+        DocumentChunk("i:0", "exact", intel, 0, 1),
+    ]
+    vectorstore.upsert_chunks(chunks, [[0.9, 0.1], [0.1, 0.9], [-1.0, 0.0], [1.0, 0.0]])
+    provider = SimpleNamespace(embed=lambda _texts: [[1.0, 0.0]])
+
+    hits = vectorstore.query("q", top_k=2, embedding_provider=provider)
+    assert [hit.id for hit in hits] == ["i:0", "d:0"]
+    filtered = vectorstore.query("q", collections=["doctrine"], embedding_provider=provider)
+    assert [hit.id for hit in filtered] == ["d:0", "d:1", "d:2"]
+    assert filtered[0].metadata["tags"] == ["x", "y"]
+    strict = vectorstore.query("q", min_score=0.6, embedding_provider=provider)
+    assert [hit.id for hit in strict] == ["i:0", "d:0"]
+
+
+def test_fallback_query_top_k_keeps_store_order_for_ties(monkeypatch):
+    """Test equal scores keep insertion order and top_k=0 returns nothing."""
+    from types import SimpleNamespace
+
+    from wargame_mcp import vectorstore
+    from wargame_mcp.documents import DocumentChunk, DocumentMetadata
+
+    if not vectorstore._use_fallback_store():
+        pytest.skip("chromadb installed; fallback store not in use")
+    monkeypatch.setattr(vectorstore, "_fallback_store", [])
+    metadata = DocumentMetadata(document_id="d", source_path=Path("d.md"))
+    chunks = [DocumentChunk(f"d:{i}", "t", metadata, i, 3) for i in range(3)]
+    vectorstore.upsert_chunks(chunks, [[0.0, 1.0], [1.0, 0.0], [1.0, 0.0]])
+    provider = SimpleNamespace(embed=lambda _texts: [[1.0, 0.0]])
+
+    hits = vectorstore.query("q", top_k=2, embedding_provider=provider)
+    assert [hit.id for hit in hits] == ["d:1", "d:2"]
+    assert vectorstore.query("q", top_k=0, embedding_provider=provider) == []
+
+
+def test_cosine_scores_match_pairwise_similarity():
+    """Test the fused fallback scorer agrees with _cosine_similarity, including edge cases."""
+    import math
+
+    from wargame_mcp.vectorstore import _cosine_scores, _cosine_similarity
+
+    query = [0.3, -0.2, 0.9]
+    stored = [[0.1, 0.4, -0.2], [0.0, 0.0, 0.0], [1.0, 2.0], []]
+    entries = [{"embedding": v, "norm": math.hypot(*v)} for v in stored]
+    entries.append({"embedding": [0.5, 0.5, 0.5]})
+
+    expected = [_cosine_similarity(query, entry["embedding"]) for entry in entries]
+    assert _cosine_scores(query, math.hypot(*query), entries) == pytest.approx(expected)
+
+
+def test_persistent_client_is_reused_per_path(monkeypatch, tmp_path):
+    """Test the Chroma client is opened once per persist directory."""
+    from types import SimpleNamespace
+
+    from wargame_mcp import vectorstore
+
+    opened: list[str] = []
+    fake_chromadb = SimpleNamespace(PersistentClient=lambda path: opened.append(path) or path)
+    monkeypatch.setattr(vectorstore, "_import_chromadb", lambda: fake_chromadb)
+    vectorstore._persistent_client.cache_clear()
+    try:
+        path = str(tmp_path / "chroma")
+        assert vectorstore._persistent_client(path) == path
+        assert vectorstore._persistent_client(path) == path
+        assert opened == [path]
+        assert (tmp_path / "chroma").is_dir()
+    finally:
+        vectorstore._persistent_client.cache_clear()
+
+
+def test_upsert_chunks_accepts_packed_vector_rows(monkeypatch):
+    """Test embeddings may arrive as packed float32 rows from a generator."""
+    from array import array
+
+    from wargame_mcp import vectorstore
+
+    if not vectorstore._use_fallback_store():
+        pytest.skip("chromadb installed; fallback store not in use")
+    monkeypatch.setattr(vectorstore, "_fallback_store", [])
+    metadata = DocumentMetadata(document_id="doc", source_path=Path("doc.md"))
+    chunks = [DocumentChunk(f"doc:{i}", "t", metadata, i, 2) for i in range(2)]
+
+    vectorstore.upsert_chunks(chunks, (array("f", v) for v in ([3.0, 4.0], [0.0, 0.0])))
+
+    stored = [list(entry["embedding"]) for entry in vectorstore._fallback_store]
+    assert stored == [pytest.approx([0.6, 0.8]), [0.0, 0.0]]
@@ -7,60 +7,79 @@ import pytest
 from wargame_mcp.vectorstore import SearchResult
 
 
-def test_search_result_creation():
-    """Test SearchResult dataclass."""
-    result = SearchResult(
-        id="chunk-123",
-        text="Test chunk text",
-        score=0.95,
-        metadata={"collection": "test", "document_id": "doc-1"},
-    )
-
-    assert result.id == "chunk-123"
+@pytest.mark.parametrize(
+    ("score", "metadata"),
+    [
+        (0.95, {"collection": "test", "document_id": "doc-1"}),
+        (0.8, {}),
+        (0.0, {}),
+        (0.5, {}),
+        (0.99, {}),
+        (1.0, {}),
+        (0.987654321, {}),
+        (
+            0.88,
+            {
+                "collection": "nato",
+                "document_id": "doc-123",
+                "title": "Urban Warfare",
+                "year": 2024,
+                "tags": ["doctrine", "urban"],
+                "chunk_index": 5,
+                "chunk_count": 20,
+            },
+        ),
+    ],
+    ids=[
+        "basic",
+        "empty-metadata",
+        "score-0",
+        "score-0.5",
+        "score-0.99",
+        "score-1",
+        "score-precision",
+        "complex-metadata",
+    ],
+)
+def test_search_result_fields(score, metadata):
+    """Test SearchResult keeps its fields exactly as given."""
+    result = SearchResult(id="chunk-1", text="Test chunk text", score=score, metadata=metadata)
+
+    assert result.id == "chunk-1"
     assert result.text == "Test chunk text"
-    assert result.score == 0.95
-    assert result.metadata["collection"] == "test"
-
-
-def test_search_result_with_empty_metadata():
-    """Test SearchResult with empty metadata."""
-    result = SearchResult(
-        id="chunk-1",
-        text="Text",
-        score=0.8,
-        metadata={},
-    )
-
-    assert result.metadata == {}
-
-
-def test_search_result_score_bounds():
-    """Test SearchResult with various score values."""
-    # Test valid scores
-    for score in [0.0, 0.5, 0.99, 1.0]:
-        result = SearchResult(id="test", text="text", score=score, metadata={})
-        assert result.score == score
-
-
-def test_search_result_with_complex_metadata():
-    """Test SearchResult with complex metadata."""
-    metadata = {
-        "collection": "nato",
-        "document_id": "doc-123",
-        "title": "Urban Warfare",
-        "year": 2024,
-        "tags": ["doctrine", "urban"],
-        "chunk_index": 5,
-        "chunk_count": 20,
+    assert result.score == score
+    assert result.metadata == metadata
+
+
+def test_build_search_results_filters_and_splits_tags():
+    """Test Chroma rows become scored results with min_score applied and tags split."""
+    from wargame_mcp.vectorstore import _build_search_results
+
+    results = {
+        "ids": [["a", "b"]],
+        "documents": [["alpha", "bravo"]],
+        "metadatas": [[{"tags": "x,y"}, {"tags": ""}]],
+        "distances": [[0.25, 0.75]],
     }
 
-    result = SearchResult(
-        id="chunk-1",
-        text="Complex metadata test",
-        score=0.88,
-        metadata=metadata,
-    )
+    hits = _build_search_results(results, min_score=0.5)
+
+    assert [(hit.id, hit.score, hit.metadata["tags"]) for hit in hits] == [("a", 0.75, ["x", "y"])]
+
+
+def test_build_search_results_stops_at_first_row_below_min_score():
+    """Test rows after the first one under min_score are never scored."""
+    from wargame_mcp.vectorstore import _build_search_results
+
+    class _Unreached:
+        def __float__(self) -> float:
+            raise AssertionError("row past the min_score cut-off was scored")
+
+    results = {
+        "ids": [["a", "b", "c"]],
+        "documents": [["alpha", "bravo", "charlie"]],
+        "metadatas": [[{}, {}, {}]],
+        "distances": [[0.1, 0.6, _Unreached()]],
+    }
 
-    assert result.metadata["year"] == 2024
-    assert result.metadata["tags"] == ["doctrine", "urban"]
-    assert result.metadata["chunk_index"] == 5
+    assert [hit.id for hit in _build_search_results(results, min_score=0.5)] == ["a"]